@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Needed for the live feed (/api/live/), which keeps connections open:
+    uvicorn NOTICE.asgi:application --host 0.0.0.0 --port 8000
+Use a single worker process (or sticky sessions): the live hub is in-process.
 """
 
 import os
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -55,6 +57,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
 
     'corsheaders.middleware.CorsMiddleware',
 
@@ -67,6 +71,13 @@ MIDDLEWARE = [
 
 ]
 
+# Response compression (api/compression.py); Brotli needs `pip install brotli`
+COMPRESSIBLE_TYPES = ('application/json', 'text/calendar')
+COMPRESSION_MIN_SIZE = 1024         # bytes; smaller bodies gain little
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5      # 11 is much slower for a few % more
+COMPRESSION_CACHE_SECONDS = 60 * 60 * 24
+
 ROOT_URLCONF = 'NOTICE.urls'
 
 TEMPLATES = [
@@ -115,6 +126,45 @@ DATABASES = {
     }
 }
 
+# SQLite production profile, opt-in with CAMPUS_SQLITE_PRODUCTION=1 (see api/sqlite.py).
+# It switches the database file to WAL, which keeps db.sqlite3-wal/-shm files next to it.
+SQLITE_PRODUCTION = os.environ.get('CAMPUS_SQLITE_PRODUCTION', '0') == '1'
+SQLITE_PRAGMAS = {}
+if SQLITE_PRODUCTION:
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',         # readers no longer wait for writers
+        'synchronous': 'NORMAL',       # safe with WAL; fsync at checkpoints only
+        'busy_timeout': 5000,          # ms a writer waits for the lock before "database is locked"
+        'cache_size': -20000,          # 20 MB page cache per connection
+        'mmap_size': 134217728,        # 128 MB memory-mapped reads
+        'temp_store': 'MEMORY',
+    }
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('CAMPUS_CONN_MAX_AGE', 600)),  # reuse connections across requests
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',  # take the write lock at BEGIN: no deadlocked lock upgrades
+            'timeout': 5,
+        },
+    })
+
+# Read replicas: safe requests read from them (api/routers.py, api/middleware.py).
+#   CAMPUS_DB_REPLICAS=db_replica.sqlite3          SQLite files next to db.sqlite3 (local testing,
+#                                                  fill them with `manage.py sync_sqlite_replicas`)
+#   CAMPUS_DB_REPLICAS=10.0.0.21,10.0.0.22         hosts serving a replica of the same database
+DATABASE_REPLICAS = []
+for _index, _location in enumerate(filter(None, os.environ.get('CAMPUS_DB_REPLICAS', '').split(','))):
+    _replica = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if _replica['ENGINE'].endswith('sqlite3'):
+        _replica['NAME'] = BASE_DIR / _location.strip()
+    else:
+        _replica['HOST'] = _location.strip()
+    DATABASES[f'replica{_index + 1}'] = _replica
+    DATABASE_REPLICAS.append(f'replica{_index + 1}')
+
+DATABASE_ROUTERS = ['api.routers.PrimaryReplicaRouter']
+PRIMARY_PIN_SECONDS = 5  # after a write, the client reads from the primary for this long
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -134,6 +184,9 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Email + password login in one indexed query (username login still works for the admin)
+AUTHENTICATION_BACKENDS = ['api.backends.EmailBackend']
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -170,14 +223,74 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # for admin login
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # <== JWT here
+        'api.authentication.ClaimsJWTAuthentication',  # <== JWT here (reads skip the user query)
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
         # 'rest_framework.permissions.AllowAny',
     ),
+    # orjson when installed, stdlib json otherwise (api/renderers.py).
+    # Back to DRF's own classes: rest_framework.renderers.JSONRenderer / rest_framework.parsers.JSONParser
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Proxies in front of Django whose X-Forwarded-For entry is trusted.
+    # 0 = use REMOTE_ADDR: a client-sent X-Forwarded-For cannot dodge the per-IP limits.
+    # Behind nginx/a load balancer set CAMPUS_NUM_PROXIES=1 (one per proxy hop).
+    'NUM_PROXIES': int(os.environ.get('CAMPUS_NUM_PROXIES', 0)),
+    # Auth endpoint limits (api/throttling.py), per client address and per email
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_email': '10/min',
+        'forgot_password_ip': '10/hour',
+        'forgot_password_email': '3/hour',
+        'reset_password_ip': '20/hour',
+        'reset_password_email': '5/hour',   # a 6-digit code cannot be brute-forced
+        'device_heartbeat_ip': '120/min',   # generous: a campus NAT puts many phones behind one IP
+    },
 }
 
+
+# CACHES
+# The default cache is picked with CAMPUS_CACHE, the rate limiter's own cache with
+# CAMPUS_RATELIMIT_CACHE:
+#   locmem (default, per process) | file:/var/tmp/campus-cache (shared by the
+#   workers of one host) | redis://127.0.0.1:6379/1 (needs the redis package)
+RATELIMIT_CACHE_ALIAS = 'ratelimit'
+
+
+def _cache(location, name):
+    if location.startswith('redis://'):
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': location}
+    if location.startswith('file:'):
+        return {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location[len('file:'):]}
+    return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': name}
+
+
+CACHES = {
+    'default': _cache(os.environ.get('CAMPUS_CACHE', 'locmem'), ''),
+    RATELIMIT_CACHE_ALIAS: _cache(os.environ.get('CAMPUS_RATELIMIT_CACHE', 'locmem'), 'ratelimit'),
+}
+
+# The read-your-writes pin (api/middleware.py) must be seen by every worker
+if DATABASE_REPLICAS and CACHES['default']['BACKEND'].endswith('LocMemCache'):
+    raise ImproperlyConfigured(
+        'CAMPUS_DB_REPLICAS needs a shared default cache: set CAMPUS_CACHE=redis://... (or file:... on one host).'
+    )
+
+# How long a worker may serve a timetable/student semester changed by another
+# worker (signals only clear the cache of the process that made the change).
+# With a shared cache (redis) this only bounds a missed invalidation.
+TIMETABLE_CACHE_SECONDS = 60
+# Unread-badge counters (api/inbox.py): only a per-process cache needs them to expire
+INBOX_COUNTER_SECONDS = 60 if CACHES['default']['BACKEND'].endswith('LocMemCache') else None
+
 AUTH_USER_MODEL = 'auth.User'
 
 from datetime import timedelta
@@ -191,6 +304,7 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': False,                   # Don’t auto-rotate tokens
     'BLACKLIST_AFTER_ROTATION': True,                 # Allow logout blacklisting
     'AUTH_HEADER_TYPES': ('Bearer',),                 # Use Bearer <token> format
+    'TOKEN_REFRESH_SERIALIZER': 'api.serializers.CampusTokenRefreshSerializer',  # in-memory blacklist check
 }
 # You can increase REFRESH_TOKEN_LIFETIME to timedelta(days=30) if you want users to stay logged in for a month.
 
@@ -206,3 +320,23 @@ EMAIL_HOST_PASSWORD = 'wlwy ugnh mpwi tdwv' #  16-digit App Password from Google
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
 WHITENOISE_USE_FINDERS = True
+
+
+#  SCHEDULER (scheduled notices, reminders, digests, cleanup)
+# Run it with `python manage.py runscheduler`, or set CAMPUS_SCHEDULER_AUTOSTART=1
+# on exactly one web process to run it in a background thread there.
+SCHEDULER_AUTOSTART = os.environ.get("CAMPUS_SCHEDULER_AUTOSTART") == "1"
+# With a separate runscheduler process, a notice scheduled from a web worker is
+# only picked up on the next resync: its push can go out up to
+# SCHEDULER_RESYNC_SECONDS after `published_at` (it becomes visible on time).
+SCHEDULER_RESYNC_SECONDS = 300    # reload from the database to catch changes made by other processes
+SCHEDULER_COALESCE_SECONDS = 5    # jobs due this close together fire as one batch (at most this late)
+
+EVENT_REMINDER_OFFSETS = [60, 15]   # minutes before an event starts
+TIMETABLE_DIGEST_TIME = "06:30"     # daily per-semester class summary push (local time), None to disable
+TOKEN_COMPACTION_TIME = "03:30"     # daily purge of expired JWT blacklist rows (local time), None to disable
+JANITOR_TIME = "04:00"              # daily purge of expired reset codes, idle devices, sessions; None to disable
+DEVICE_TOKEN_MAX_IDLE_DAYS = 90     # devices not seen for this long are dropped
+DEVICE_HEARTBEAT_FLUSH_SECONDS = 30 # buffered device last_seen updates are written this often
+CLEANUP_BATCH_SIZE = 1000           # rows per DELETE in cleanup jobs
+BLACKLIST_SYNC_SECONDS = 10         # how stale the in-memory token blacklist filter may get
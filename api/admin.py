@@ -1,7 +1,18 @@
 from django.contrib import admin
-from api.models import Notice, Routine, DeviceToken, Profile, AdmissionRecord, Event
+from api.models import Notice, NoticeAttachment, Routine, DeviceToken, Profile, AdmissionRecord, Event
+
+
+class NoticeAttachmentInline(admin.TabularInline):
+    model = NoticeAttachment
+    extra = 1
+    fields = ('file', 'original_name', 'content_type', 'size', 'sha256')
+    readonly_fields = ('size', 'sha256')
+
+
+@admin.register(Notice)
+class NoticeAdmin(admin.ModelAdmin):
+    inlines = [NoticeAttachmentInline]
 
-admin.site.register(Notice)
 admin.site.register(Routine)
 admin.site.register(DeviceToken)
 admin.site.register(Profile)
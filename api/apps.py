@@ -41,4 +41,13 @@ class ApiConfig(AppConfig):
 
         # Import signals after Firebase is ready
         # import api.signals
-        from . import signals 
+        from . import signals
+        from . import sqlite  # SQLite pragmas for every new connection
+        from . import digest  # registers the daily digest job
+        from . import maintenance  # registers the token compaction and janitor jobs
+
+        # Optionally run the job scheduler inside this process
+        from django.conf import settings
+        if settings.SCHEDULER_AUTOSTART:
+            from .scheduler import scheduler
+            scheduler.start_in_background() 
@@ -0,0 +1,140 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from .models import Event, Notice, Profile, Routine
+from .renderers import dumps
+from .serializers import (
+    EventListSerializer, EventSerializer, NoticeListSerializer, NoticeSerializer,
+    ProfileSerializer, RoutineSerializer,
+)
+from .timetable import get_user_semester
+from .views import (
+    event_list_fields, filter_events, filter_routines, get_jwt_user,
+    notice_list_fields, visible_notices,
+)
+
+
+# -------------------- ASYNC READ ENDPOINTS (/api/async/...) --------------------
+# Read-only twins of the busiest GET endpoints, written as native async views
+# with the async ORM. Under ASGI (`uvicorn NOTICE.asgi:application`) a request
+# waiting on the database no longer holds a worker thread.
+# - Same filters and serializers as the DRF viewsets (see the shared helpers in views.py).
+# - Auth is JWT only (Authorization: Bearer ...); anonymous reads behave as in the viewsets.
+# Writes stay on the regular DRF endpoints.
+
+
+async def _get_user(request):
+    """Returns (user, error_response). A bad token is a 401, like the DRF views."""
+    if "HTTP_AUTHORIZATION" not in request.META:
+        return AnonymousUser(), None
+    user = await sync_to_async(get_jwt_user)(request)
+    if user is None or not user.is_active:
+        return None, _json({"detail": "Given token not valid for any token type"}, status=401)
+    return user, None
+
+
+async def _get_semester(user):
+    if not user.is_authenticated or user.is_staff:
+        return None
+    return await sync_to_async(get_user_semester)(user)
+
+
+def _json(data, status=200):
+    # Same encoder as the DRF endpoints (orjson when installed)
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
+
+
+def _serialize(serializer_class, request, instance, many=False):
+    # Serializers expect a DRF request (query_params for ?fields=/?omit=, absolute image urls)
+    context = {"request": Request(request)}
+    return serializer_class(instance, many=many, context=context).data
+
+
+# -------------------- NOTICES --------------------
+@require_safe
+async def notice_list(request):
+    user, error = await _get_user(request)
+    if error:
+        return error
+    semester = await _get_semester(user)
+
+    queryset = visible_notices(
+        Notice.objects.order_by("-published_at"), semester, user.is_staff, request.GET.get("query")
+    )
+    notices = [notice async for notice in notice_list_fields(queryset)]
+    return _json(_serialize(NoticeListSerializer, request, notices, many=True))
+
+
+@require_safe
+async def notice_detail(request, pk):
+    user, error = await _get_user(request)
+    if error:
+        return error
+    semester = await _get_semester(user)
+
+    notice = await (
+        visible_notices(Notice.objects.prefetch_related("attachments"), semester, user.is_staff)
+        .filter(pk=pk).afirst()
+    )
+    if notice is None:
+        return _json({"detail": "No Notice matches the given query."}, status=404)
+    return _json(_serialize(NoticeSerializer, request, notice))
+
+
+# -------------------- EVENTS --------------------
+@require_safe
+async def event_list(request):
+    _user, error = await _get_user(request)
+    if error:
+        return error
+
+    try:
+        queryset = filter_events(event_list_fields(Event.objects.order_by("event_date", "start_time")), request.GET)
+    except ValidationError as exc:
+        return _json(exc.detail, status=400)
+    events = [event async for event in queryset]
+    return _json(_serialize(EventListSerializer, request, events, many=True))
+
+
+@require_safe
+async def event_detail(request, pk):
+    _user, error = await _get_user(request)
+    if error:
+        return error
+
+    event = await Event.objects.filter(pk=pk).afirst()
+    if event is None:
+        return _json({"detail": "No Event matches the given query."}, status=404)
+    return _json(_serialize(EventSerializer, request, event))
+
+
+# -------------------- ROUTINES --------------------
+@require_safe
+async def routine_list(request):
+    user, error = await _get_user(request)
+    if error:
+        return error
+    semester = await _get_semester(user)
+
+    queryset = filter_routines(Routine.objects.all(), user, semester, request.GET)
+    routines = [routine async for routine in queryset]
+    return _json(_serialize(RoutineSerializer, request, routines, many=True))
+
+
+# -------------------- PROFILE --------------------
+@require_safe
+async def profile_detail(request):
+    user, error = await _get_user(request)
+    if error:
+        return error
+    if not user.is_authenticated:
+        return _json({"detail": "Authentication credentials were not provided."}, status=401)
+
+    profile = await Profile.objects.filter(user_id=user.pk).afirst()
+    if profile is None:
+        return _json({"error": "Profile not found for this user. Please register first."}, status=404)
+    return _json(_serialize(ProfileSerializer, request, profile))
@@ -0,0 +1,141 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import token_blacklist_filter
+
+
+User = get_user_model()
+
+
+# -------------------- CLAIMS IN THE TOKEN --------------------
+# At login the token carries what most requests need about the user
+# (is_staff, semester, programme, shift) plus "cv", a hash of those values.
+# A read request whose "cv" still matches the user's current version is served
+# from the claims alone: no auth_user or Profile query.
+# The current version is cached for a short time and dropped when the user or
+# profile changes, so edits and deactivations apply within AUTH_VERSION_TTL.
+
+AUTH_VERSION_KEY = "auth:version:{user_id}"
+AUTH_VERSION_TTL = 60
+
+
+def claims_version(is_active, is_staff, semester, programme, shift):
+    raw = f"{is_active}|{is_staff}|{semester}|{programme}|{shift}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def _claims_row(user_id):
+    return (
+        User.objects.filter(pk=user_id)
+        .values_list("is_active", "is_staff", "profile__semester", "profile__programme", "profile__shift")
+        .first()
+    )
+
+
+def current_version(user_id):
+    """The user's claims version, from the cache when possible ("" for deleted users)."""
+    key = AUTH_VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        row = _claims_row(user_id)
+        version = claims_version(*row) if row else ""
+        cache.set(key, version, timeout=AUTH_VERSION_TTL)
+    return version
+
+
+def forget_version(user_id):
+    cache.delete(AUTH_VERSION_KEY.format(user_id=user_id))
+
+
+class CampusRefreshToken(RefreshToken):
+    """
+    Refresh token (and the access tokens made from it) carrying the user's claims.
+    The blacklist is checked against an in-memory filter first (api/blacklist.py).
+    """
+
+    def check_blacklist(self):
+        if token_blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        token_blacklist_filter.added(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        is_active, is_staff, semester, programme, shift = _claims_row(user.pk)
+        token["is_staff"] = is_staff
+        token["semester"] = None if semester is None else str(semester)
+        token["programme"] = programme
+        token["shift"] = shift
+        token["cv"] = claims_version(is_active, is_staff, semester, programme, shift)
+        return token
+
+
+# -------------------- CLAIMS USER --------------------
+class ClaimsUser:
+    """
+    Authenticated user built from token claims.
+    Anything the token does not carry (username, date_joined, profile...) loads
+    the real User once, on first access.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    from_token = True
+
+    def __init__(self, token):
+        self.id = self.pk = token[api_settings.USER_ID_CLAIM]
+        self.is_staff = token.get("is_staff", False)
+        self.semester = token.get("semester")
+        self.programme = token.get("programme")
+        self.shift = token.get("shift")
+        self._user = None
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__
+        if name.startswith("__") or name == "_user":
+            raise AttributeError(name)
+        if self._user is None:
+            self._user = User.objects.get(pk=self.pk)
+        return getattr(self._user, name)
+
+    def __eq__(self, other):
+        return getattr(other, "pk", None) == self.pk and getattr(other, "is_authenticated", False)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"user {self.pk}"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that skips the auth_user query on read requests.
+    - GET/HEAD/OPTIONS with an up-to-date "cv" claim: request.user is a ClaimsUser.
+    - Writes, old tokens and stale claims: the real User, loaded as before.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and "cv" in validated_token:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+            if validated_token["cv"] == current_version(user_id):
+                return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
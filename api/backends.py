@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+
+UserModel = get_user_model()
+
+
+def users_by_email(email):
+    """
+    Case-insensitive email lookup written as LOWER(email) = LOWER(%s) AND email > '',
+    which matches the partial unique index of migration 0016 instead of scanning auth_user.
+    """
+    return UserModel._default_manager.alias(email_lower=Lower("email")).filter(
+        email_lower=Lower(Value(email)), email__gt=""
+    )
+
+
+# -------------------- EMAIL LOGIN BACKEND --------------------
+class EmailBackend(ModelBackend):
+    """
+    authenticate(request, email=..., password=...) resolves the user with one
+    indexed query and checks the password once.
+    - Username logins (Django admin) fall through to the default ModelBackend behaviour.
+    - Unknown emails still run the password hasher, so response time does not
+      reveal which emails have an account.
+    """
+
+    def authenticate(self, request, username=None, password=None, email=None, **kwargs):
+        if email is None:
+            return super().authenticate(request, username=username, password=password, **kwargs)
+        if password is None:
+            return None
+
+        try:
+            user = users_by_email(email).get()
+        except (UserModel.DoesNotExist, UserModel.MultipleObjectsReturned):
+            UserModel().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
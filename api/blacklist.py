@@ -0,0 +1,112 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+# -------------------- BLACKLISTED TOKEN FILTER --------------------
+# Every token refresh asks "is this jti blacklisted?". Almost always the answer is
+# no, so a bloom filter of blacklisted jtis answers in memory and the database is
+# only asked when the filter says "maybe" (real hit or ~1% false positive).
+# A bloom filter has no false negatives, so it is safe as long as it has seen
+# every blacklisted jti:
+# - built from the table on first use,
+# - updated in-process on logout,
+# - synced from the table (rows with a higher id) when the cache generation moves
+#   (another process logged someone out) or every BLACKLIST_SYNC_SECONDS.
+# With a process-local cache (LocMemCache) only the interval applies across processes.
+
+BLACKLIST_GENERATION_KEY = "token_blacklist:generation"
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenBlacklistFilter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_id = 0          # highest BlacklistedToken id already added
+        self._generation = None
+        self._synced_at = 0.0
+
+    def _rebuild(self):
+        rows = BlacklistedToken.objects.order_by("id").values_list("id", "token__jti")
+        total = rows.count()
+        bloom = BloomFilter(capacity=max(total * 2, 10000))
+        last_id = 0
+        for row_id, jti in rows.iterator(chunk_size=5000):
+            bloom.add(jti)
+            last_id = row_id
+        self._bloom, self._last_id = bloom, last_id
+
+    def _sync(self):
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=self._last_id)
+            .order_by("id").values_list("id", "token__jti")
+        )
+        for row_id, jti in rows:
+            self._bloom.add(jti)
+            self._last_id = row_id
+        if self._bloom.count > self._bloom.capacity:
+            self._rebuild()  # too full: error rate would climb
+
+    def _refresh(self):
+        generation = cache.get(BLACKLIST_GENERATION_KEY, 0)
+        now = time.monotonic()
+        with self._lock:
+            if self._bloom is None:
+                self._rebuild()
+            elif generation != self._generation or now - self._synced_at >= settings.BLACKLIST_SYNC_SECONDS:
+                self._sync()
+            else:
+                return
+            self._generation, self._synced_at = generation, now
+
+    def might_contain(self, jti):
+        """False means the jti is certainly not blacklisted."""
+        self._refresh()
+        return jti in self._bloom
+
+    def added(self, jti):
+        """Call after a token was blacklisted in this process."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+        try:
+            cache.incr(BLACKLIST_GENERATION_KEY)
+        except ValueError:
+            cache.add(BLACKLIST_GENERATION_KEY, 1, timeout=None)
+
+    def reset(self):
+        """Forget everything; rebuilt on next use (after compaction removed rows)."""
+        with self._lock:
+            self._bloom = None
+            self._last_id = 0
+
+
+token_blacklist_filter = TokenBlacklistFilter()
@@ -0,0 +1,96 @@
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+try:
+    import brotli
+except ImportError:  # optional: `pip install brotli`; gzip only without it
+    brotli = None
+
+
+# -------------------- RESPONSE COMPRESSION --------------------
+# Notice lists carry long text and go to phones over mobile data; JSON and ICS
+# shrink several-fold. Used by CompressionMiddleware (api/middleware.py):
+# - Brotli when the client accepts it and the module is installed, else gzip.
+# - Only COMPRESSIBLE_TYPES at least COMPRESSION_MIN_SIZE bytes long. The live
+#   feed (text/event-stream) is never touched: buffering would delay events.
+# - Streaming responses (ICS feeds) are compressed chunk by chunk, never buffered.
+# - A response with `compressed_cache_key` set (e.g. the timetable blob) keeps its
+#   compressed bytes in the cache, so the same payload is compressed only once.
+
+COMPRESSED_CACHE_KEY = "compressed:{encoding}:{key}"
+ACCEPT_ENCODING_RE = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header; unparsable entries are ignored."""
+    accepted = {}
+    for part in (header or "").lower().split(","):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if match:
+            coding, q = match.groups()
+            try:
+                accepted[coding] = float(q) if q else 1.0
+            except ValueError:
+                continue
+    return accepted
+
+
+def choose_encoding(header):
+    """"br", "gzip" or None (send the response as it is). Brotli wins a tie."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get("*", 0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best = max(candidates, key=lambda coding: accepted.get(coding, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return content_type in settings.COMPRESSIBLE_TYPES
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_cached(data, encoding, key):
+    """compress(), reusing the bytes stored under `key` (a key that changes with the content)."""
+    cache_key = COMPRESSED_CACHE_KEY.format(encoding=encoding, key=key)
+    compressed = cache.get(cache_key)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        cache.set(cache_key, compressed, timeout=settings.COMPRESSION_CACHE_SECONDS)
+    return compressed
+
+
+def _stream_compressor(encoding):
+    """(process, finish): feed chunks to process(), end with finish()."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    return compressor.compress, compressor.flush
+
+
+def compress_stream(chunks, encoding):
+    process, finish = _stream_compressor(encoding)
+    for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(chunks, encoding):
+    process, finish = _stream_compressor(encoding)
+    async for chunk in chunks:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -0,0 +1,97 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import DeviceToken
+
+
+# -------------------- DEVICE REGISTRATION --------------------
+def register_device(token, user_id=None):
+    """
+    Insert the token or move it to this user, in one INSERT ... ON CONFLICT (token) DO UPDATE.
+    Anonymous registrations (user_id None) only refresh last_seen: they never
+    detach a device from the user who registered it.
+    """
+    unique_fields = ["token"] if connection.features.supports_update_conflicts_with_target else None
+    DeviceToken.objects.bulk_create(
+        [DeviceToken(token=token, user_id=user_id, last_seen=timezone.now())],
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=["last_seen"] if user_id is None else ["user", "last_seen"],
+    )
+
+
+# -------------------- HEARTBEATS --------------------
+# An app open only marks the token as seen in memory. The buffer is written with
+# one UPDATE ... WHERE token IN (...) per chunk, so thousands of launches cost a
+# handful of writes. It is flushed:
+# - by the request that notices DEVICE_HEARTBEAT_FLUSH_SECONDS have passed,
+# - as soon as it holds FLUSH_CHUNK_SIZE tokens, so it never grows past one chunk,
+# - by a timer DEVICE_HEARTBEAT_FLUSH_SECONDS after the first buffered token, so
+#   an idle worker does not sit on heartbeats until its next request.
+# last_seen is only used to drop long-idle devices, so a few seconds of lag do not matter.
+
+FLUSH_CHUNK_SIZE = 500  # stays under SQLite's bound-parameter limit
+
+
+class HeartbeatBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._flushed_at = time.monotonic()
+        self._timer = None
+
+    def touch(self, token):
+        with self._lock:
+            self._pending.add(token)
+            due = (
+                len(self._pending) >= FLUSH_CHUNK_SIZE
+                or time.monotonic() - self._flushed_at >= settings.DEVICE_HEARTBEAT_FLUSH_SECONDS
+            )
+            if not due and self._timer is None:
+                self._timer = threading.Timer(settings.DEVICE_HEARTBEAT_FLUSH_SECONDS, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered heartbeats; returns the number of tokens updated."""
+        with self._lock:
+            tokens, self._pending = list(self._pending), set()
+            self._flushed_at = time.monotonic()
+        if not tokens:
+            return 0
+
+        now = timezone.now()
+        updated = 0
+        for start in range(0, len(tokens), FLUSH_CHUNK_SIZE):
+            updated += DeviceToken.objects.filter(
+                token__in=tokens[start:start + FLUSH_CHUNK_SIZE]
+            ).update(last_seen=now)
+        return updated
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Could not flush device heartbeats: {e}")
+        finally:
+            connection.close()  # the timer thread's own connection
+
+
+heartbeats = HeartbeatBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        heartbeats.flush()
+    except Exception as e:
+        print(f"Could not flush device heartbeats: {e}")
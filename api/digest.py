@@ -0,0 +1,82 @@
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import DeviceToken, Routine
+from .scheduler import next_daily_time, scheduler
+from .utils import send_fcm_multicast
+
+
+DIGEST_JOB = "timetable_digest"
+
+
+def render_daily_digests(day=None):
+    """
+    Pre-render today's classes for every semester with one grouped query.
+    Returns {semester: {"title", "body", "data"}} ready to push.
+    """
+    day = day or timezone.localdate()
+    rows = (
+        Routine.objects.filter(day_ordinal=Routine.ordinal_for_date(day))
+        .order_by("semester", "start_time")
+        .values_list("semester", "subject", "start_time", "end_time")
+    )
+
+    classes = defaultdict(list)
+    for semester, subject, start_time, end_time in rows:
+        classes[semester].append((subject, start_time, end_time))
+
+    digests = {}
+    for semester, slots in classes.items():
+        digests[semester] = {
+            "title": f"Today's classes ({day:%A}): {len(slots)}",
+            "body": ", ".join(f"{start:%H:%M} {subject}" for subject, start, _end in slots)[:200],
+            "data": {
+                "type": "timetable_digest",
+                "semester": semester,
+                "date": day.isoformat(),
+                "classes": json.dumps(
+                    [[subject, start.strftime("%H:%M"), end.strftime("%H:%M")] for subject, start, end in slots],
+                    separators=(",", ":"),
+                ),
+            },
+        }
+    return digests
+
+
+def send_daily_digests(day=None):
+    """
+    Push each semester's digest to that semester's devices.
+    Device tokens of all semesters are fetched in one query; each semester is one multicast.
+    """
+    digests = render_daily_digests(day)
+    if not digests:
+        return {}
+
+    tokens = defaultdict(list)
+    rows = DeviceToken.objects.filter(
+        user__profile__semester__in=[int(semester) for semester in digests]
+    ).values_list("user__profile__semester", "token")
+    for semester, token in rows:
+        tokens[str(semester)].append(token)
+
+    results = {}
+    for semester, digest in digests.items():
+        results[semester] = send_fcm_multicast(tokens[semester], **digest)
+    return results
+
+
+# -------------------- SCHEDULING --------------------
+def run_digest_job(payloads):
+    send_daily_digests()
+    scheduler.schedule(DIGEST_JOB, "daily", next_daily_time(settings.TIMETABLE_DIGEST_TIME))
+
+
+def load_digest_job(scheduler):
+    if settings.TIMETABLE_DIGEST_TIME:
+        scheduler.schedule(DIGEST_JOB, "daily", next_daily_time(settings.TIMETABLE_DIGEST_TIME))
+
+
+scheduler.register(DIGEST_JOB, run_digest_job, loader=load_digest_job)
@@ -0,0 +1,106 @@
+import re
+
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+
+# -------------------- RANGED FILE DOWNLOADS --------------------
+# FileResponse streams a file in small blocks (constant memory) but always sends
+# all of it. These helpers add single-range requests (RFC 9110) so a mobile
+# download that drops halfway resumes with `Range: bytes=<received>-`.
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """
+    Returns (start, end) inclusive, None to send the whole file
+    (no/unsupported header, e.g. multiple ranges) or "invalid" for a 416.
+    """
+    match = RANGE_RE.match(header.replace(" ", "")) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "invalid"
+    return start, end
+
+
+class RangedFile:
+    """Read-only view of `length` bytes of a file starting at `start`."""
+
+    def __init__(self, fileobj, start, length):
+        fileobj.seek(start)
+        self.fileobj = fileobj
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fileobj.close()
+
+
+def _if_range_matches(request, etag, last_modified):
+    """A Range is only honoured if the client's copy is still current (If-Range)."""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+
+def ranged_file_response(request, open_file, size, etag, content_type, filename, last_modified=None):
+    """
+    Stream a file with Range/206, If-Range and If-None-Match/304 support.
+    `open_file` is only called when bytes are actually sent.
+    """
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        return HttpResponse(status=304, headers=headers)
+
+    byte_range = None
+    if _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.headers.get("Range"), size)
+    if byte_range == "invalid":
+        return HttpResponse(status=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    fileobj = open_file()
+    if byte_range is None:
+        response = FileResponse(fileobj, content_type=content_type, filename=filename)
+        response["Content-Length"] = size
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangedFile(fileobj, start, end - start + 1),
+            status=206, content_type=content_type, filename=filename,
+        )
+        response["Content-Length"] = end - start + 1
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    for name, value in headers.items():
+        response[name] = value
+    return response
@@ -0,0 +1,143 @@
+import json
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Event, Routine
+from .timetable import get_timetable
+
+
+# -------------------- iCalendar (RFC 5545) feeds --------------------
+# Routine and event times are stored without a timezone, so they are written as
+# "floating" local times: calendar apps show them in the campus' local time.
+
+PRODID = "-//CampusConnect//Calendar//EN"
+ICAL_DAYS = ["SU", "MO", "TU", "WE", "TH", "FR", "SA"]  # indexed by Routine day_ordinal
+
+
+def escape_text(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line to 75 octets as the RFC requires, ending with CRLF."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never split inside a multi-byte UTF-8 character
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _local(value):
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _calendar(name, events):
+    yield fold("BEGIN:VCALENDAR")
+    yield fold("VERSION:2.0")
+    yield fold(f"PRODID:{PRODID}")
+    yield fold("CALSCALE:GREGORIAN")
+    yield fold("METHOD:PUBLISH")
+    yield fold(f"X-WR-CALNAME:{escape_text(name)}")
+    yield fold("REFRESH-INTERVAL;VALUE=DURATION:PT6H")
+    yield fold("X-PUBLISHED-TTL:PT6H")
+    for lines in events:
+        for line in lines:
+            yield fold(line)
+    yield fold("END:VCALENDAR")
+
+
+# -------------------- ROUTINES --------------------
+def routine_anchor(today=None):
+    """Weekly recurrences start from Jan 1st of the current year, so the feed is stable all year."""
+    today = today or timezone.localdate()
+    return date(today.year, 1, 1)
+
+
+def routine_etag(semester):
+    etag, _body = get_timetable(semester)
+    return "%s-%s" % (etag.strip('"'), routine_anchor().year)
+
+
+def routine_calendar(semester):
+    """Yield the weekly timetable of a semester as an iCalendar feed (one RRULE per class)."""
+    _etag, body = get_timetable(semester)
+    anchor = routine_anchor()
+    dtstamp = _utc(datetime.combine(anchor, time.min, tzinfo=dt_timezone.utc))
+    anchor_ordinal = Routine.ordinal_for_date(anchor)
+
+    def events():
+        for day, slots in json.loads(body)["days"].items():
+            ordinal = Routine.ordinal_for(day)
+            if ordinal is None:
+                continue
+            first_day = anchor + timedelta(days=(ordinal - anchor_ordinal) % 7)
+            for slot in slots:
+                start = datetime.combine(first_day, time.fromisoformat(slot["start_time"]))
+                end = datetime.combine(first_day, time.fromisoformat(slot["end_time"]))
+                yield [
+                    "BEGIN:VEVENT",
+                    f"UID:routine-{slot['id']}@campusconnect",
+                    f"DTSTAMP:{dtstamp}",
+                    f"DTSTART:{_local(start)}",
+                    f"DTEND:{_local(end)}",
+                    f"RRULE:FREQ=WEEKLY;BYDAY={ICAL_DAYS[ordinal]}",
+                    f"SUMMARY:{escape_text(slot['subject'])}",
+                    "END:VEVENT",
+                ]
+
+    return _calendar(f"Semester {semester} Routine", events())
+
+
+# -------------------- EVENTS --------------------
+def event_etag():
+    # Any create/edit moves max(updated); a delete changes the count
+    stats = Event.objects.aggregate(count=Count("id"), last=Max("updated"))
+    last = stats["last"].timestamp() if stats["last"] else 0
+    return f"events-{stats['count']}-{last:.6f}"
+
+
+def event_calendar():
+    """Yield every event as an iCalendar feed, streaming rows from the database."""
+    rows = (
+        Event.objects.order_by("event_date", "start_time")
+        .values_list("id", "event_title", "event_date", "start_time", "end_time",
+                     "event_detail", "location", "updated")
+        .iterator(chunk_size=500)
+    )
+
+    def events():
+        for event_id, title, event_date, start_time, end_time, detail, location, updated in rows:
+            yield [
+                "BEGIN:VEVENT",
+                f"UID:event-{event_id}@campusconnect",
+                f"DTSTAMP:{_utc(updated)}",
+                f"DTSTART:{_local(datetime.combine(event_date, start_time))}",
+                f"DTEND:{_local(datetime.combine(event_date, end_time))}",
+                f"SUMMARY:{escape_text(title)}",
+                f"DESCRIPTION:{escape_text(detail)}",
+                f"LOCATION:{escape_text(location)}",
+                "END:VEVENT",
+            ]
+
+    return _calendar("Campus Events", events())
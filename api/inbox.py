@@ -0,0 +1,245 @@
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Event, InboxRead, InboxState, Notice, Routine
+
+
+# -------------------- INBOX (fan-out on read) --------------------
+# A broadcast never writes per-user rows. The inbox is derived at read time from
+# Notice/Event and the audience rules below; per user we only keep a "read up to"
+# watermark (InboxState) and the few items read individually after it (InboxRead).
+
+
+def notice_audience(semester):
+    """
+    Notices a user may see: campus-wide ones plus those targeted at their semester.
+    Users without a semester (admins) get the campus-wide ones.
+    """
+    if semester is None:
+        return Q(semester__isnull=True)
+    return Q(semester__isnull=True) | Q(semester=semester)
+
+
+def get_watermark(user):
+    """Everything published up to this moment counts as read. Defaults to when the user joined."""
+    last_read_at = InboxState.objects.filter(user_id=user.pk).values_list("last_read_at", flat=True).first()
+    return last_read_at or user.date_joined
+
+
+# Page cursor: (timestamp, type, id) of the last item sent, as "<iso>,<type>,<id>".
+# Items are ordered by that whole tuple, so items sharing a timestamp (several
+# notices scheduled for 09:00) are never skipped at a page boundary.
+ITEM_TYPES = ("event", "notice")  # tuple order: "event" < "notice"
+
+
+def encode_cursor(item):
+    return f"{item['timestamp'].isoformat()},{item['type']},{item['id']}"
+
+
+def parse_cursor(value):
+    """(timestamp, type, id), or None if malformed. A bare timestamp means "older than it"."""
+    parts = value.split(",")
+    timestamp = parse_datetime(parts[0])
+    if timestamp is None:
+        return None
+    if len(parts) == 1:
+        return timestamp, None, None
+    if len(parts) != 3 or parts[1] not in ITEM_TYPES or not parts[2].isdigit():
+        return None
+    return timestamp, parts[1], int(parts[2])
+
+
+def _older_than(field, kind, cursor):
+    """Rows of `kind` that come after `cursor` in (timestamp, type, id) descending order."""
+    timestamp, cursor_kind, cursor_id = cursor
+    older = Q(**{f"{field}__lt": timestamp})
+    if cursor_kind is None or kind > cursor_kind:
+        return older
+    if kind < cursor_kind:
+        return older | Q(**{field: timestamp})
+    return older | Q(**{field: timestamp, "id__lt": cursor_id})
+
+
+def inbox_items(user, semester, before=None, limit=20):
+    """
+    One page of the inbox, newest first, with keyset pagination on (timestamp, type, id).
+    `before` is a parsed cursor (parse_cursor); returns (items, next cursor or None).
+    Costs three small indexed queries whatever the number of students or broadcasts.
+    """
+    now = timezone.now()
+    notices = Notice.objects.filter(notice_audience(semester), published_at__lte=now)
+    events = Event.objects.all()
+    if before is not None:
+        notices = notices.filter(_older_than("published_at", "notice", before))
+        events = events.filter(_older_than("created", "event", before))
+
+    notice_rows = (
+        {"type": "notice", "id": notice_id, "title": title, "timestamp": published_at}
+        for notice_id, title, published_at in notices.order_by("-published_at", "-id")
+        .values_list("id", "title", "published_at")[:limit]
+    )
+    event_rows = (
+        {"type": "event", "id": event_id, "title": title, "timestamp": created}
+        for event_id, title, created in events.order_by("-created", "-id")
+        .values_list("id", "event_title", "created")[:limit]
+    )
+    items = list(heapq.merge(
+        notice_rows, event_rows, key=lambda item: (item["timestamp"], item["type"], item["id"]), reverse=True
+    ))[:limit]
+
+    watermark = get_watermark(user)
+    unread = [item for item in items if item["timestamp"] > watermark]
+    read_ids = set()
+    if unread:
+        read_ids = set(
+            InboxRead.objects.filter(
+                user_id=user.pk, object_id__in={item["id"] for item in unread}
+            ).values_list("kind", "object_id")
+        )
+
+    for item in items:
+        item["read"] = item["timestamp"] <= watermark or (item["type"], item["id"]) in read_ids
+
+    next_before = encode_cursor(items[-1]) if items and len(items) == limit else None
+    return items, next_before
+
+
+def mark_read(user, kind, object_ids, semester=None):
+    """Mark individual items read (one INSERT, duplicates ignored)."""
+    InboxRead.objects.bulk_create(
+        [InboxRead(user_id=user.pk, kind=kind, object_id=object_id) for object_id in object_ids],
+        ignore_conflicts=True,
+    )
+    cache.delete(_baseline_key(user, semester))
+
+
+def mark_all_read(user, semester=None):
+    """Move the watermark to now; individually-read rows below it are no longer needed."""
+    now = timezone.now()
+    InboxState.objects.update_or_create(user_id=user.pk, defaults={"last_read_at": now})
+    InboxRead.objects.filter(user_id=user.pk).delete()
+    cache.set(_baseline_key(user, semester), _fresh_total(semester), timeout=BASELINE_TIMEOUT)
+    return now
+
+
+# -------------------- UNREAD BADGE --------------------
+# Cached counters of published items per audience, bumped by the Notice/Event signals:
+#   campus-wide notices + events, and notices per semester.
+# Per user we cache a "baseline": the audience total minus the user's unread count at
+# the time it was computed. unread = total now - baseline, so a badge request is a
+# couple of cache reads. Deletes/edits bump an epoch that invalidates every baseline
+# (they are rare admin actions); counters missing from the cache are rebuilt from the database.
+# A notice counts once it is pushed (notified_at set): publish_notices bumps the counter
+# at that moment, so a counter built earlier never counts it twice.
+# A baseline is always computed together with fresh counts from the database, which
+# also replace this process' counters: total and baseline come from the same snapshot,
+# so a stale counter can never leave a baseline too low (a badge that over-counts).
+# With a per-process cache (LocMemCache) counters expire after INBOX_COUNTER_SECONDS
+# so bumps made in another process (runscheduler, other workers) show up; the
+# rebuild is an index-only COUNT on (semester, notified_at). With a shared cache
+# every process sees the bumps and counters are never rebuilt.
+
+COUNTER_ALL = "inbox:count:all"
+COUNTER_SEMESTER = "inbox:count:sem:{semester}"
+BADGE_EPOCH = "inbox:epoch"
+BASELINE_KEY = "inbox:baseline:{epoch}:{user_id}:{semester}"
+BASELINE_TIMEOUT = 60 * 60 * 24
+
+
+def _count_all():
+    return (
+        Notice.objects.filter(semester__isnull=True, notified_at__isnull=False).count()
+        + Event.objects.count()
+    )
+
+
+def _count_semester(semester):
+    return Notice.objects.filter(semester=semester, notified_at__isnull=False).count()
+
+
+def _counter(key, build):
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.add(key, value, timeout=settings.INBOX_COUNTER_SECONDS)
+    return value
+
+
+def _fresh_total(semester):
+    """Count the audience total in the database and make it this process' counters."""
+    total = _count_all()
+    cache.set(COUNTER_ALL, total, timeout=settings.INBOX_COUNTER_SECONDS)
+    if semester is not None:
+        in_semester = _count_semester(semester)
+        cache.set(COUNTER_SEMESTER.format(semester=semester), in_semester, timeout=settings.INBOX_COUNTER_SECONDS)
+        total += in_semester
+    return total
+
+
+def visible_total(semester):
+    total = _counter(COUNTER_ALL, _count_all)
+    if semester is not None:
+        total += _counter(COUNTER_SEMESTER.format(semester=semester), lambda: _count_semester(semester))
+    return total
+
+
+def _baseline_key(user, semester):
+    epoch = cache.get_or_set(BADGE_EPOCH, 0, timeout=None)
+    return BASELINE_KEY.format(epoch=epoch, user_id=user.pk, semester=semester)
+
+
+def _unread_from_db(user, semester):
+    watermark = get_watermark(user)
+    reads = InboxRead.objects.filter(user_id=user.pk)
+    return (
+        Notice.objects.filter(notice_audience(semester), published_at__gt=watermark, notified_at__isnull=False)
+        .exclude(id__in=reads.filter(kind="notice").values("object_id"))
+        .count()
+        + Event.objects.filter(created__gt=watermark)
+        .exclude(id__in=reads.filter(kind="event").values("object_id"))
+        .count()
+    )
+
+
+def unread_count(user, semester):
+    """Unread notices + events for the badge; constant time once the user's baseline is cached."""
+    key = _baseline_key(user, semester)
+    baseline = cache.get(key)
+    if baseline is None:
+        unread = _unread_from_db(user, semester)
+        cache.set(key, _fresh_total(semester) - unread, timeout=BASELINE_TIMEOUT)
+        return unread
+    return max(visible_total(semester) - baseline, 0)
+
+
+def count_published(semester=None, delta=1):
+    """Called when an item becomes visible (delta=1) or a visible one is deleted (delta=-1)."""
+    key = COUNTER_ALL if semester is None else COUNTER_SEMESTER.format(semester=semester)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        pass  # not cached yet; it will be counted from the database when first needed
+    if delta < 0:
+        reset_badges()
+
+
+def reset_badges():
+    """Invalidate every user's baseline (after deletes or audience edits)."""
+    try:
+        cache.incr(BADGE_EPOCH)
+    except ValueError:
+        cache.add(BADGE_EPOCH, 1, timeout=None)
+
+
+def reset_badge_counters():
+    """Drop every counter so it is recounted from the database (after audience edits)."""
+    cache.delete_many(
+        [COUNTER_ALL]
+        + [COUNTER_SEMESTER.format(semester=semester) for semester, _label in Routine.SEMESTER_CHOICES]
+    )
+    reset_badges()
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+
+
+# -------------------- LIVE UPDATES HUB --------------------
+# In-process pub/sub feeding the Server-Sent Events endpoint (/api/live/).
+# Model signals publish small messages ("notice 12 created"). All open SSE
+# connections of an event loop await the same future (shielded, so a connection's
+# heartbeat timeout never cancels it); a publish resolves one future per loop,
+# so idle connections cost no CPU and waking them is O(loops), not O(connections).
+# Run the app under ASGI (e.g. `uvicorn NOTICE.asgi:application`) so one worker
+# can hold thousands of connections.
+# Signals must fire in the same process: notices published by a separate
+# `runscheduler` process (scheduled notices) never reach this hub; clients see
+# them on their next list refresh. Run the scheduler in the web process
+# (SCHEDULER_AUTOSTART) to have them announced live.
+
+
+class LiveHub:
+    def __init__(self, size=1000):
+        self._buffer = deque(maxlen=size)  # recent messages, for Last-Event-ID resume
+        self._lock = threading.Lock()
+        self._futures = {}                  # loop -> future all its waiting connections share
+        self._started_id = time.time_ns() // 1000
+        self._last_id = self._started_id
+
+    def _new_id(self):
+        # Microsecond clock, strictly increasing: ids stay ordered across restarts
+        self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+        return self._last_id
+
+    def publish(self, kind, object_id, action, semester=None):
+        """Thread-safe; called from model signals."""
+        with self._lock:
+            message = {
+                "id": self._new_id(),
+                "type": kind,
+                "object_id": object_id,
+                "action": action,
+                "semester": semester,
+            }
+            self._buffer.append(message)
+            futures, self._futures = self._futures, {}
+
+        for loop, future in futures.items():
+            if not loop.is_closed():  # a loop that ended (e.g. a test client) keeps no waiters
+                loop.call_soon_threadsafe(_wake, future)
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def since(self, last_id):
+        """
+        Messages newer than last_id.
+        Returns None if some may have been missed (id from before this process
+        started, or already dropped from the buffer): the client must refetch.
+        """
+        with self._lock:
+            if last_id < self._started_id:
+                return None
+            if len(self._buffer) == self._buffer.maxlen and last_id < self._buffer[0]["id"]:
+                return None
+            return [message for message in self._buffer if message["id"] > last_id]
+
+    async def wait(self, last_id, timeout):
+        """Wait up to `timeout` seconds for messages newer than last_id."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._buffer and self._buffer[-1]["id"] > last_id:
+                future = None
+            else:
+                future = self._futures.get(loop)
+                if future is None:
+                    future = self._futures[loop] = loop.create_future()
+
+        if future is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.since(last_id)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+hub = LiveHub()
+
+
+def is_visible(message, semester, is_staff):
+    """Same audience rule as the notice list: campus-wide or the user's semester."""
+    if is_staff or message["semester"] is None:
+        return True
+    return str(message["semester"]) == str(semester)
+
+
+def format_sse(message):
+    data = json.dumps(
+        {key: message[key] for key in ("type", "object_id", "action")}, separators=(",", ":")
+    )
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {data}\n\n"
@@ -0,0 +1,117 @@
+import time as clock
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from .blacklist import token_blacklist_filter
+from .models import DeviceToken, PasswordResetCode
+from .scheduler import next_daily_time, scheduler
+
+
+COMPACT_TOKENS_JOB = "compact_tokens"
+JANITOR_JOB = "janitor"
+
+
+def delete_in_batches(queryset, batch_size=None, pause=0.0):
+    """
+    Delete the rows of `queryset` one primary-key range at a time:
+    find the pk `batch_size` rows ahead, then DELETE ... WHERE pk > last AND pk <= that.
+    Each DELETE touches a bounded slice of the table and holds its locks briefly.
+    Works for integer and string keys. Returns the number of rows deleted (cascades not included).
+    """
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    label = queryset.model._meta.label
+    deleted, last = 0, None
+    while True:
+        window = queryset if last is None else queryset.filter(pk__gt=last)
+        upper = window.order_by("pk").values_list("pk", flat=True)[batch_size - 1:batch_size]
+        upper = next(iter(upper), None)
+
+        batch = window if upper is None else window.filter(pk__lte=upper)
+        _total, per_model = batch.delete()
+        deleted += per_model.get(label, 0)
+        if upper is None:
+            return deleted
+        last = upper
+        if pause:
+            clock.sleep(pause)
+
+
+# -------------------- JWT TOKEN COMPACTION --------------------
+def compact_tokens(now=None, batch_size=None):
+    """
+    Remove expired refresh tokens from the token_blacklist tables.
+    An expired token is rejected on its `exp` claim anyway, so its rows are dead weight.
+    """
+    now = now or timezone.now()
+    started = clock.monotonic()
+    blacklisted = delete_in_batches(
+        BlacklistedToken.objects.filter(token__expires_at__lt=now), batch_size
+    )
+    outstanding = delete_in_batches(
+        OutstandingToken.objects.filter(expires_at__lt=now), batch_size
+    )
+    if blacklisted:
+        token_blacklist_filter.reset()  # rebuilt without the removed jtis
+    return {
+        "blacklisted": blacklisted,
+        "outstanding": outstanding,
+        "seconds": round(clock.monotonic() - started, 3),
+    }
+
+
+def run_compaction_job(payloads):
+    result = compact_tokens()
+    print(f"Token compaction: {result}")
+    scheduler.schedule(COMPACT_TOKENS_JOB, "daily", next_daily_time(settings.TOKEN_COMPACTION_TIME))
+
+
+def load_compaction_job(scheduler):
+    if settings.TOKEN_COMPACTION_TIME:
+        scheduler.schedule(COMPACT_TOKENS_JOB, "daily", next_daily_time(settings.TOKEN_COMPACTION_TIME))
+
+
+scheduler.register(COMPACT_TOKENS_JOB, run_compaction_job, loader=load_compaction_job)
+
+
+# -------------------- JANITOR --------------------
+def janitor_querysets(now=None):
+    """What the janitor deletes, by name."""
+    now = now or timezone.now()
+    return {
+        "password reset codes": PasswordResetCode.objects.filter(
+            created_at__lt=now - PasswordResetCode.EXPIRY
+        ),
+        # Idle devices are most likely uninstalled; they would only fail in every broadcast
+        "device tokens": DeviceToken.objects.filter(
+            last_seen__lt=now - timedelta(days=settings.DEVICE_TOKEN_MAX_IDLE_DAYS)
+        ),
+        "sessions": Session.objects.filter(expire_date__lt=now),
+    }
+
+
+def run_janitor(now=None, batch_size=None, dry_run=False):
+    """Returns [{"name", "deleted", "seconds"}] (with dry_run, the number that would be deleted)."""
+    results = []
+    for name, queryset in janitor_querysets(now).items():
+        started = clock.monotonic()
+        deleted = queryset.count() if dry_run else delete_in_batches(queryset, batch_size)
+        results.append({"name": name, "deleted": deleted, "seconds": round(clock.monotonic() - started, 3)})
+    return results
+
+
+def run_janitor_job(payloads):
+    for result in run_janitor():
+        print(f"Janitor: {result['deleted']} {result['name']} deleted in {result['seconds']}s")
+    scheduler.schedule(JANITOR_JOB, "daily", next_daily_time(settings.JANITOR_TIME))
+
+
+def load_janitor_job(scheduler):
+    if settings.JANITOR_TIME:
+        scheduler.schedule(JANITOR_JOB, "daily", next_daily_time(settings.JANITOR_TIME))
+
+
+scheduler.register(JANITOR_JOB, run_janitor_job, loader=load_janitor_job)
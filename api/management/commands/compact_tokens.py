@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from api.maintenance import compact_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding/blacklisted JWT refresh tokens in small batches. Runs daily in runscheduler too."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Rows per DELETE (default: CLEANUP_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        result = compact_tokens(batch_size=options["batch_size"])
+        self.stdout.write(
+            f"Deleted {result['blacklisted']} blacklisted and {result['outstanding']} outstanding "
+            f"tokens in {result['seconds']}s."
+        )
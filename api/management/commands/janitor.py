@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.maintenance import run_janitor
+
+
+class Command(BaseCommand):
+    help = "Delete expired reset codes, idle device tokens and expired sessions in small batches. Runs daily in runscheduler too."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Rows per DELETE (default: CLEANUP_BATCH_SIZE).")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be deleted.")
+
+    def handle(self, *args, **options):
+        verb = "would be deleted" if options["dry_run"] else "deleted"
+        for result in run_janitor(batch_size=options["batch_size"], dry_run=options["dry_run"]):
+            self.stdout.write(f"{result['name']}: {result['deleted']} {verb} in {result['seconds']}s")
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api.scheduler import scheduler
+
+
+class Command(BaseCommand):
+    help = "Run the job scheduler (scheduled notices, reminders, digests, cleanup) in the foreground."
+
+    def handle(self, *args, **options):
+        self.stdout.write("Scheduler started. Press CTRL+C to stop.")
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            scheduler.stop()
+        self.stdout.write("Scheduler stopped.")
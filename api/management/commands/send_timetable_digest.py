@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from api.digest import render_daily_digests, send_daily_digests
+
+
+class Command(BaseCommand):
+    help = "Push today's classes to every semester (one push per semester). Use it from cron if runscheduler is not running."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Send the digest for this date (YYYY-MM-DD) instead of today.")
+        parser.add_argument("--dry-run", action="store_true", help="Print the digests without sending them.")
+
+    def handle(self, *args, **options):
+        day = None
+        if options["date"]:
+            try:
+                day = parse_date(options["date"])
+            except ValueError:  # well formed but impossible, e.g. 2026-13-01
+                day = None
+            if day is None:
+                raise CommandError(f"--date must be a valid YYYY-MM-DD date, got {options['date']!r}.")
+
+        if options["dry_run"]:
+            for semester, digest in sorted(render_daily_digests(day).items()):
+                self.stdout.write(f"Semester {semester}: {digest['title']} - {digest['body']}")
+            return
+
+        for semester, result in sorted(send_daily_digests(day).items()):
+            self.stdout.write(
+                f"Semester {semester}: {result['success_count']} sent, {result['failure_count']} failed."
+            )
@@ -0,0 +1,30 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary into the SQLite replica files (DATABASE_REPLICAS). "
+        "For trying replica routing locally; run it again (or from cron) to 'replicate'."
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES["default"]
+        if "sqlite3" not in primary["ENGINE"]:
+            raise CommandError("Only for SQLite; real replicas are kept in sync by the database server.")
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError("No replicas configured (set CAMPUS_DB_REPLICAS).")
+
+        source = sqlite3.connect(primary["NAME"])
+        try:
+            for alias in settings.DATABASE_REPLICAS:
+                target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+                try:
+                    source.backup(target)  # consistent online copy
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: copied from {primary['NAME']}")
+        finally:
+            source.close()
@@ -0,0 +1,151 @@
+import hashlib
+
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .compression import (
+    acompress_stream, choose_encoding, compress, compress_cached, compress_stream, is_compressible,
+)
+from .routers import reset_replicas, use_replicas
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_KEY = "db:pin:{client}"
+
+
+def _token_user(request):
+    """User id from a Bearer token, without verifying it: only used to pick the pin key."""
+    scheme, _, raw = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+    if scheme.lower() != "bearer" or not raw:
+        return None
+    try:
+        payload = jwt.decode(raw.strip(), options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get(jwt_settings.USER_ID_CLAIM)
+
+
+def _client_key(request):
+    """
+    Who is asking: the token's user, else the session, else the address.
+    The user id survives access-token refreshes, so a client stays pinned after
+    refreshing its token. A forged token can at worst pin someone to the primary.
+    """
+    user_id = _token_user(request)
+    if user_id is not None:
+        ident = f"user:{user_id}"
+    else:
+        ident = (
+            request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+            or request.META.get("REMOTE_ADDR", "")
+        )
+    return PIN_KEY.format(client=hashlib.sha1(ident.encode()).hexdigest())
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe requests read from the replicas (api/routers.py).
+    After a successful write the client is pinned to the primary for
+    PRIMARY_PIN_SECONDS, so it reads its own writes despite replication lag.
+    The pin lives in the default cache, which must be shared by all workers
+    (settings refuse CAMPUS_DB_REPLICAS with a per-process cache).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _before(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return None, None
+        key = _client_key(request)
+        replicas = request.method in SAFE_METHODS and not cache.get(key)
+        return key, use_replicas(replicas)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        key, token = self._before(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                reset_replicas(token)
+        self._pin(request, response, key)
+        return response
+
+    async def __acall__(self, request):
+        key, token = self._before(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                reset_replicas(token)
+        self._pin(request, response, key)
+        return response
+
+    def _pin(self, request, response, key):
+        if key and request.method not in SAFE_METHODS and response.status_code < 400:
+            cache.set(key, 1, timeout=settings.PRIMARY_PIN_SECONDS)
+
+
+class CompressionMiddleware:
+    """
+    Brotli/gzip for JSON and calendar responses (api/compression.py).
+    - Vary: Accept-Encoding on every compressible response.
+    - Skips small bodies, 206/304, already-encoded responses and bodies that would not shrink.
+    - The ETag becomes weak: the bytes changed, the representation did not.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._compress(request, await self.get_response(request))
+
+    def _compress(self, request, response):
+        if not is_compressible(response) or response.has_header("Content-Encoding"):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if response.status_code in (206, 304):
+            return response
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(response.streaming_content, encoding)
+            del response["Content-Length"]
+        else:
+            content = response.content
+            if len(content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            key = getattr(response, "compressed_cache_key", None)
+            compressed = compress_cached(content, encoding, key) if key else compress(content, encoding)
+            if len(compressed) >= len(content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
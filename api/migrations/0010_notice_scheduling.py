@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 19:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_notices_notified(apps, schema_editor):
+    # Notices published before scheduling existed were already pushed on create
+    Notice = apps.get_model('api', 'Notice')
+    Notice.objects.filter(published_at__isnull=False).update(notified_at=models.F('published_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_admissionrecord_image_admissionrecord_user_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notice',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_existing_notices_notified, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='notice',
+            name='published_at',
+            field=models.DateTimeField(blank=True, help_text='Set a future time to schedule the notice.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['published_at'], name='api_notice_publish_c5389e_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:10
+
+from django.db import migrations, models
+
+
+WEEKDAY_ORDINALS = {
+    'sunday': 0, 'monday': 1, 'tuesday': 2, 'wednesday': 3,
+    'thursday': 4, 'friday': 5, 'saturday': 6,
+}
+
+
+def fill_day_ordinal(apps, schema_editor):
+    Routine = apps.get_model('api', 'Routine')
+    for day, ordinal in WEEKDAY_ORDINALS.items():
+        Routine.objects.filter(day__iexact=day).update(day_ordinal=ordinal)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_notice_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='routine',
+            name='day_ordinal',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_day_ordinal, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='routine',
+            index=models.Index(fields=['semester', 'day_ordinal', 'start_time'], name='api_routine_semeste_715495_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_routine_day_ordinal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='updated',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_event_created_updated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'start_time'], name='api_event_event_d_45c17e_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_event_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxRead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('notice', 'Notice'), ('event', 'Event')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('read_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='InboxState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='semester',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Only students of this semester see it. Leave empty for everyone.', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['created'], name='api_event_created_5af675_idx'),
+        ),
+        migrations.AddField(
+            model_name='inboxread',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_reads', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='inboxstate',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_state', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='inboxread',
+            constraint=models.UniqueConstraint(fields=('user', 'kind', 'object_id'), name='unique_inbox_read'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:10
+
+import api.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeAttachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to=api.models.attachment_upload_to)),
+                ('original_name', models.CharField(blank=True, max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('size', models.PositiveBigIntegerField(default=0, editable=False)),
+                ('sha256', models.CharField(editable=False, max_length=64)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('notice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='api.notice')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+
+
+INDEX_NAME = "auth_user_email_lower_uniq"
+
+
+def create_email_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor not in ("sqlite", "postgresql"):
+        # MySQL has no partial indexes and blank emails repeat; logins still work, unindexed
+        print(f"Skipping {INDEX_NAME}: not supported on {connection.vendor}.")
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT LOWER(email), COUNT(*) FROM auth_user WHERE email > '' "
+            "GROUP BY LOWER(email) HAVING COUNT(*) > 1"
+        )
+        duplicates = cursor.fetchall()
+    if duplicates:
+        listed = ", ".join(f"{email} ({count} users)" for email, count in duplicates)
+        raise RuntimeError(
+            f"Cannot create {INDEX_NAME}: these emails belong to several users: {listed}. "
+            "Merge or change them, then run migrate again."
+        )
+
+    # `email > ''` (not `<> ''`) so the ORM lookup can repeat the exact same term,
+    # which SQLite needs before it will use a partial index
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (LOWER(email)) WHERE email > ''"
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    """
+    Unique index on LOWER(email) for the email login backend (api/backends.py).
+    Blank emails are left out, so users without an email are not affected.
+    """
+
+    dependencies = [
+        ('api', '0015_notice_attachment'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
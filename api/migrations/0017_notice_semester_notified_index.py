@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_user_email_lower_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['semester', 'notified_at'], name='api_notice_semeste_ba8cb9_idx'),
+        ),
+    ]
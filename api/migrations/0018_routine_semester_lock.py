@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-19 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_notice_semester_notified_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoutineSemesterLock',
+            fields=[
+                ('semester', models.CharField(max_length=2, primary_key=True, serialize=False)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
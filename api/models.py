@@ -1,3 +1,7 @@
+import hashlib
+import mimetypes
+import os
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -35,9 +39,9 @@ class DeviceToken(models.Model):
         return f"{username} - {self.token[:20]}..."
 
     def update_last_seen(self):
-        """Call this when the user opens the app to update last_seen timestamp."""
-        self.last_seen = timezone.now()
-        self.save(update_fields=['last_seen'])
+        """Call this when the user opens the app; buffered and written in bulk (api/devices.py)."""
+        from .devices import heartbeats
+        heartbeats.touch(self.token)
 
 # class DeviceToken(models.Model):
 #     user = models.ForeignKey(User, related_name='device_tokens', on_delete=models.CASCADE, null=True, blank=True)
@@ -54,7 +58,9 @@ class Notice(models.Model):
     content = models.TextField()
     featured_image = models.ImageField(upload_to="notice_images/%Y/%m/%d/", null=True, blank=False)
     author = models.ForeignKey("auth.User", on_delete = models.CASCADE)
-    published_at = models.DateTimeField(null=True, blank=True)
+    semester = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Only students of this semester see it. Leave empty for everyone.")
+    published_at = models.DateTimeField(null=True, blank=True, help_text="Set a future time to schedule the notice.")
+    notified_at = models.DateTimeField(null=True, blank=True, editable=False)  # when the push went out
     updated = models.DateTimeField(auto_now=True)
     created = models.DateTimeField(auto_now_add=True)
 
@@ -63,6 +69,57 @@ class Notice(models.Model):
     
     class Meta:
         ordering = ['-published_at']
+        indexes = [
+            models.Index(fields=['published_at']),
+            models.Index(fields=['semester', 'notified_at']),  # unread-badge counters (api/inbox.py)
+        ]
+
+
+def attachment_upload_to(instance, filename):
+    # Content-hashed path: new bytes get a new URL, so downloads can be cached forever
+    extension = os.path.splitext(filename)[1].lower()
+    return f"notice_attachments/{instance.sha256[:2]}/{instance.sha256}{extension}"
+
+
+class NoticeAttachment(models.Model):
+    """
+    A file (PDF circular, exam schedule...) attached to a notice.
+    Hash, size and type are filled in on save; identical files are stored once.
+    """
+    notice = models.ForeignKey(Notice, on_delete=models.CASCADE, related_name="attachments")
+    file = models.FileField(upload_to=attachment_upload_to)
+    original_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField(default=0, editable=False)
+    sha256 = models.CharField(max_length=64, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.original_name or self.file.name
+
+    class Meta:
+        ordering = ['id']
+
+    def save(self, *args, **kwargs):
+        if self.file and not self.file._committed:
+            digest = hashlib.sha256()
+            for chunk in self.file.chunks():
+                digest.update(chunk)
+            self.sha256 = digest.hexdigest()
+            self.size = self.file.size
+            self.original_name = self.original_name or os.path.basename(self.file.name)
+            self.content_type = (
+                self.content_type
+                or mimetypes.guess_type(self.original_name)[0]
+                or "application/octet-stream"
+            )
+
+            path = attachment_upload_to(self, self.original_name)
+            if self.file.storage.exists(path):
+                # Same bytes already uploaded: point at them instead of storing a copy
+                self.file.name = path
+                self.file._committed = True
+        super().save(*args, **kwargs)
 
 
 class Routine(models.Model):
@@ -76,6 +133,12 @@ class Routine(models.Model):
         # ('Saturday', 'Saturday'),
     ]
 
+    # Week order used for sorting (the string "Friday" sorts before "Monday")
+    WEEKDAY_ORDINALS = {
+        'sunday': 0, 'monday': 1, 'tuesday': 2, 'wednesday': 3,
+        'thursday': 4, 'friday': 5, 'saturday': 6,
+    }
+
     SEMESTER_CHOICES = [
         ('1', '1st Semester'),
         ('2', '2nd Semester'),
@@ -89,13 +152,51 @@ class Routine(models.Model):
 
     semester = models.CharField(max_length=2, choices=SEMESTER_CHOICES)
     day = models.CharField(max_length=10, choices=DAYS_OF_WEEK)
+    day_ordinal = models.PositiveSmallIntegerField(editable=False)  # kept in sync with `day` on save
     subject = models.CharField(max_length=100)
     start_time = models.TimeField()
     end_time = models.TimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['semester', 'day_ordinal', 'start_time']),
+        ]
+
     def __str__(self):
         return f"{self.semester} | {self.day} | {self.subject} ({self.start_time} - {self.end_time})"
 
+    @classmethod
+    def ordinal_for(cls, day):
+        """Weekday ordinal (Sunday=0) for a day name, case-insensitive. None if unknown."""
+        return cls.WEEKDAY_ORDINALS.get(str(day).strip().lower())
+
+    @classmethod
+    def ordinal_for_date(cls, day):
+        """Weekday ordinal (Sunday=0) of a date or datetime; Python's weekday() has Monday=0."""
+        return (day.weekday() + 1) % 7
+
+    @classmethod
+    def is_semester(cls, value):
+        """True for one of SEMESTER_CHOICES ("1".."8" or the int)."""
+        return str(value).strip() in dict(cls.SEMESTER_CHOICES)
+
+    def save(self, *args, **kwargs):
+        self.day_ordinal = self.ordinal_for(self.day)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'day' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'day_ordinal'}
+        super().save(*args, **kwargs)
+
+
+# One row per semester, locked by routine writes so that the clash check and the
+# insert happen as one step (row locks on existing routines do not cover new rows)
+class RoutineSemesterLock(models.Model):
+    semester = models.CharField(max_length=2, primary_key=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Routine lock for semester {self.semester}"
+
 
 class Profile(models.Model):
     # SHIFT_CHOICES = [
@@ -153,6 +254,14 @@ class Event(models.Model):
     event_detail = models.TextField()
     location = models.CharField(max_length=255)
     image = models.ImageField(upload_to="events/")
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event_date', 'start_time']),
+            models.Index(fields=['created']),
+        ]
     
     def __str__(self):
         return self.event_title
@@ -160,12 +269,45 @@ class Event(models.Model):
 
 
 class PasswordResetCode(models.Model):
+    EXPIRY = timedelta(minutes=10)  # expired codes are purged by the janitor (api/maintenance.py)
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='reset_code')
     code = models.CharField(max_length=6)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def is_expired(self):
-        return timezone.now() > self.created_at + timedelta(minutes=10)
+        return timezone.now() > self.created_at + self.EXPIRY
+
+    def __str__(self):
+        return f"{self.user.username} - {self.code}"
+
+
+# Per-user inbox state. Inbox items themselves are never copied per user:
+# they are read from Notice/Event, and everything up to `last_read_at` counts as read.
+class InboxState(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='inbox_state')
+    last_read_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user.username} read up to {self.last_read_at}"
+
+
+# Items read individually after the watermark (cleared when the watermark moves past them)
+class InboxRead(models.Model):
+    KIND_CHOICES = [
+        ('notice', 'Notice'),
+        ('event', 'Event'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='inbox_reads')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'kind', 'object_id'], name='unique_inbox_read'),
+        ]
 
     def __str__(self):
-        return f"{self.user.username} - {self.code}"
\ No newline at end of file
+        return f"{self.user.username} read {self.kind} {self.object_id}"
@@ -0,0 +1,105 @@
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .inbox import count_published
+from .live import hub
+from .models import DeviceToken, Notice
+from .scheduler import scheduler
+from .utils import send_fcm_multicast, send_fcm_to_all
+
+
+PUBLISH_JOB = "publish_notices"
+
+
+def _notice_message(batch):
+    """Push payload for [(notice_id, title), ...] going to one audience."""
+    if len(batch) == 1:
+        notice_id, title = batch[0]
+        return {
+            "title": f"New Notice: {title}",
+            "body": "Tap to view details.",
+            "data": {"notice_id": str(notice_id)},
+        }
+    return {
+        "title": f"{len(batch)} new notices",
+        "body": ", ".join(title for _id, title in batch)[:200],
+        "data": {"notice_ids": ",".join(str(notice_id) for notice_id, _title in batch)},
+    }
+
+
+def publish_notices(notice_ids):
+    """
+    Send one push for every notice in `notice_ids` that is due and not pushed yet.
+
+    Notices are claimed with a single UPDATE stamping `notified_at`, so a notice
+    is never pushed twice even if the scheduler and a signal race for it.
+    Several notices going out at the same moment share one push per audience.
+    """
+    stamp = timezone.now()
+    claimed = Notice.objects.filter(
+        pk__in=notice_ids,
+        notified_at__isnull=True,
+        published_at__lte=stamp,
+    ).update(notified_at=stamp)
+    if not claimed:
+        return 0
+
+    notices = list(
+        Notice.objects.filter(pk__in=notice_ids, notified_at=stamp)
+        .order_by("published_at")
+        .values_list("id", "title", "semester")
+    )
+    for notice_id, _title, semester in notices:
+        count_published(semester)
+        hub.publish("notice", notice_id, "created", semester)
+
+    # One push per audience: notices for everyone go to every device,
+    # semester notices only to the devices of that semester's students.
+    audiences = defaultdict(list)
+    for notice_id, title, semester in notices:
+        audiences[semester].append((notice_id, title))
+
+    tokens = defaultdict(list)
+    semesters = [semester for semester in audiences if semester is not None]
+    if semesters:
+        rows = DeviceToken.objects.filter(
+            user__profile__semester__in=semesters
+        ).values_list("user__profile__semester", "token")
+        for semester, token in rows:
+            tokens[semester].append(token)
+
+    for semester, batch in audiences.items():
+        message = _notice_message(batch)
+        if semester is None:
+            send_fcm_to_all(**message)
+        else:
+            send_fcm_multicast(tokens[semester], **message)
+    return len(notices)
+
+
+def schedule_notice(notice):
+    """
+    Publish now if due, otherwise queue it on the in-process scheduler.
+    A scheduler running in another process picks it up on its next resync.
+    """
+    if notice.notified_at is not None or notice.published_at is None:
+        scheduler.cancel(PUBLISH_JOB, notice.pk)
+        return
+
+    if notice.published_at <= timezone.now():
+        publish_notices([notice.pk])
+    elif scheduler.running:
+        scheduler.schedule(PUBLISH_JOB, notice.pk, notice.published_at, notice.pk)
+
+
+def load_scheduled_notices(scheduler):
+    """Queue every notice that has not been pushed yet (overdue ones fire right away)."""
+    pending = Notice.objects.filter(
+        notified_at__isnull=True, published_at__isnull=False
+    ).values_list("id", "published_at")
+    for notice_id, published_at in pending:
+        scheduler.schedule(PUBLISH_JOB, notice_id, published_at, notice_id)
+
+
+scheduler.register(PUBLISH_JOB, publish_notices, loader=load_scheduled_notices)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Event
+from .scheduler import scheduler
+from .utils import send_fcm_to_all
+
+
+REMINDER_JOB = "event_reminders"
+
+
+def event_start(event_date, start_time):
+    """Events store a naive date + time in the campus timezone."""
+    return timezone.make_aware(datetime.combine(event_date, start_time))
+
+
+def schedule_event_reminders(event):
+    """
+    Queue one reminder per EVENT_REMINDER_OFFSETS (minutes before the start).
+    Rescheduling an edited event replaces its previous reminders.
+    """
+    if not scheduler.running:
+        return
+    start = event_start(event.event_date, event.start_time)
+    now = timezone.now()
+    for offset in settings.EVENT_REMINDER_OFFSETS:
+        when = start - timedelta(minutes=offset)
+        if when > now:
+            scheduler.schedule(REMINDER_JOB, (event.pk, offset), when, (event.pk, offset))
+        else:
+            scheduler.cancel(REMINDER_JOB, (event.pk, offset))
+
+
+def cancel_event_reminders(event_id):
+    for offset in settings.EVENT_REMINDER_OFFSETS:
+        scheduler.cancel(REMINDER_JOB, (event_id, offset))
+
+
+def send_event_reminders(payloads):
+    """
+    Send one push per reminder offset for every event due at this wake-up.
+    Events are re-read first, so edits made by another process since the
+    reminder was queued are respected (moved events are picked up again on resync).
+    """
+    now = timezone.now()
+    slack = timedelta(seconds=settings.SCHEDULER_COALESCE_SECONDS)
+    events = Event.objects.in_bulk({event_id for event_id, _offset in payloads})
+
+    due = {}
+    for event_id, offset in payloads:
+        event = events.get(event_id)
+        if event is None:
+            continue
+        start = event_start(event.event_date, event.start_time)
+        if start <= now or start - timedelta(minutes=offset) > now + slack:
+            continue  # already started, or moved to a later time
+        due.setdefault(offset, []).append(event)
+
+    for offset, due_events in sorted(due.items()):
+        if len(due_events) == 1:
+            event = due_events[0]
+            send_fcm_to_all(
+                title=f"Starting in {offset} minutes: {event.event_title}",
+                body=f"{event.location} at {event.start_time:%H:%M}",
+                data={"event_id": str(event.id)}
+            )
+        else:
+            send_fcm_to_all(
+                title=f"{len(due_events)} events start in {offset} minutes",
+                body=", ".join(event.event_title for event in due_events)[:200],
+                data={"event_ids": ",".join(str(event.id) for event in due_events)}
+            )
+
+
+def load_event_reminders(scheduler):
+    """Queue reminders for every event that has not started yet."""
+    now = timezone.localtime()
+    upcoming = Event.objects.filter(event_date__gte=now.date()).values_list(
+        "id", "event_date", "start_time"
+    )
+    offsets = settings.EVENT_REMINDER_OFFSETS
+    for event_id, event_date, start_time in upcoming:
+        start = event_start(event_date, start_time)
+        for offset in offsets:
+            when = start - timedelta(minutes=offset)
+            if when > now:
+                scheduler.schedule(REMINDER_JOB, (event_id, offset), when, (event_id, offset))
+
+
+scheduler.register(REMINDER_JOB, send_event_reminders, loader=load_event_reminders)
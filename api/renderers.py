@@ -0,0 +1,64 @@
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: `pip install orjson`; the stdlib json is used without it
+    orjson = None
+
+
+# -------------------- FAST JSON (orjson) --------------------
+# DRF's JSONRenderer/JSONParser go through the stdlib json module, which is a
+# visible part of rendering the notice, event and routine lists. With orjson
+# installed these classes encode/decode in C; datetimes, dates, times and UUIDs
+# are handled natively, and anything else (Decimal, lazy strings, querysets...)
+# goes through DRF's own encoder, so the output matches the default renderer
+# except for two cases:
+# - raw datetimes keep their microseconds,
+# - NaN/Infinity floats are written as null, where the default renderer
+#   (STRICT_JSON) raises. No model field here stores them.
+# Non-string dict keys (DRF ListField/DictField errors use int keys) are
+# converted to strings, as json.dumps does.
+# Without orjson, or for things orjson cannot do (indented output for the
+# browsable API, ensure_ascii, non-UTF-8 request bodies), the stdlib path is used.
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+_drf_default = JSONEncoder().default
+
+
+def dumps(data):
+    """JSON bytes for `data`, the same as FastJSONRenderer().render(data)."""
+    if orjson is None:
+        return renderers.JSONRenderer().render(data)
+    ret = orjson.dumps(data, default=_drf_default, option=ORJSON_OPTIONS)
+    # Like DRF: escape U+2028/U+2029 so the output is also valid JavaScript
+    if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+        ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return ret
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rejects NaN/Infinity, as the strict stdlib parser does
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
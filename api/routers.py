@@ -0,0 +1,40 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# -------------------- PRIMARY / REPLICA ROUTING --------------------
+# Reads go to a random replica (settings.DATABASE_REPLICAS) only while serving a
+# safe request from a client that has not written recently; see
+# api.middleware.ReplicaRoutingMiddleware. Everything else (writes, shell,
+# management commands, the scheduler) uses the primary, "default".
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def use_replicas(enabled):
+    """Returns a token for reset_replicas()."""
+    return _read_from_replica.set(enabled)
+
+
+def reset_replicas(token):
+    _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and _read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication (or a copy of the SQLite file)
+        return db == "default"
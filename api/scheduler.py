@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import threading
+import traceback
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+class HeapScheduler:
+    """
+    In-process job scheduler backed by a min-heap of wake-up times.
+
+    - Jobs are registered once with a batch handler: handler(payloads).
+    - Entries are keyed by (job, key); scheduling the same key again replaces it.
+    - The runner sleeps until the earliest entry is due instead of polling the database.
+    - The runner wakes SCHEDULER_COALESCE_SECONDS after the earliest entry is due, so
+      everything due within that window fires together as one batch per job.
+    - Cancelled/replaced entries are dropped lazily when they reach the top of the heap,
+      and all at once on every resync, so the heap stays the size of the live entries.
+    - Entries created in another process (a notice saved by a web worker while the
+      scheduler runs in `runscheduler`) are only seen on the next resync, so they
+      fire up to SCHEDULER_RESYNC_SECONDS late. Run the scheduler in the web process
+      (SCHEDULER_AUTOSTART) when exact timing matters.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}   # (job, key) -> (when, seq, payload)
+        self._jobs = {}      # job -> (handler, loader)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self.running = False
+
+    # -------------------- registration --------------------
+    def register(self, job, handler, loader=None):
+        """
+        handler(payloads) runs every due entry of this job in one call.
+        loader(scheduler) seeds entries from the database on start and on every resync.
+        """
+        self._jobs[job] = (handler, loader)
+
+    # -------------------- heap operations --------------------
+    def schedule(self, job, key, when, payload=None):
+        with self._cond:
+            entry = self._entries.get((job, key))
+            if entry is not None and entry[0] == when:
+                # Already queued for that time (e.g. reloaded on resync): no new heap tuple
+                self._entries[(job, key)] = (when, entry[1], payload)
+                return
+            seq = next(self._seq)
+            self._entries[(job, key)] = (when, seq, payload)
+            heapq.heappush(self._heap, (when, seq, job, key))
+            # Only wake the runner if the new entry is now the earliest one
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def cancel(self, job, key):
+        with self._cond:
+            self._entries.pop((job, key), None)
+
+    def pending(self, job=None):
+        with self._cond:
+            return sum(1 for (name, _key) in self._entries if job is None or name == job)
+
+    def _pop_due(self, now):
+        """Pop every live entry that is due, grouped by job."""
+        due = {}
+        while self._heap and self._heap[0][0] <= now:
+            when, seq, job, key = heapq.heappop(self._heap)
+            entry = self._entries.get((job, key))
+            if entry is None or entry[1] != seq:
+                continue  # cancelled or rescheduled
+            del self._entries[(job, key)]
+            due.setdefault(job, []).append(entry[2])
+        return due
+
+    def _next_timeout(self, now):
+        while self._heap:
+            when, seq, job, key = self._heap[0]
+            entry = self._entries.get((job, key))
+            if entry is not None and entry[1] == seq:
+                wake_at = when + timedelta(seconds=settings.SCHEDULER_COALESCE_SECONDS)
+                return max((wake_at - now).total_seconds(), 0)
+            heapq.heappop(self._heap)
+        return None  # nothing scheduled, sleep until notified
+
+    # -------------------- loading --------------------
+    def load(self):
+        """Seed the heap from every registered loader."""
+        for job, (_handler, loader) in self._jobs.items():
+            if loader is None:
+                continue
+            try:
+                loader(self)
+            except Exception:
+                print(f"Scheduler: loading '{job}' failed:")
+                traceback.print_exc()
+
+    def _resync(self, payloads):
+        # Picks up rows created/edited by other processes (their signals can't reach this heap)
+        self.load()
+        self._compact()
+        self._schedule_resync()
+
+    def _compact(self):
+        """Rebuild the heap from the live entries, dropping cancelled/replaced tuples."""
+        with self._cond:
+            self._heap = [(when, seq, job, key) for (job, key), (when, seq, _payload) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _schedule_resync(self):
+        interval = settings.SCHEDULER_RESYNC_SECONDS
+        if interval:
+            self.schedule("resync", "all", timezone.now() + timedelta(seconds=interval))
+
+    # -------------------- runner --------------------
+    def run(self):
+        """Run until stop() is called. Blocks the calling thread."""
+        self.register("resync", self._resync)
+        self._stopping = False
+        self.running = True
+        self.load()
+        self._schedule_resync()
+
+        try:
+            while True:
+                with self._cond:
+                    if self._stopping:
+                        break
+                    now = timezone.now()
+                    timeout = self._next_timeout(now)
+                    due = self._pop_due(now) if timeout == 0 else None
+                    if not due:
+                        self._cond.wait(timeout)
+                        continue
+
+                for job, payloads in due.items():
+                    handler = self._jobs.get(job, (None, None))[0]
+                    if handler is None:
+                        continue
+                    try:
+                        handler(payloads)
+                    except Exception:
+                        print(f"Scheduler: job '{job}' failed:")
+                        traceback.print_exc()
+        finally:
+            self.running = False
+
+    def start_in_background(self):
+        thread = threading.Thread(target=self.run, name="campus-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+
+
+def next_daily_time(at, now=None):
+    """Next occurrence of the local time `at` ("HH:MM"), for jobs that reschedule themselves daily."""
+    now = timezone.localtime(now)
+    when = timezone.make_aware(datetime.combine(now.date(), time.fromisoformat(at)))
+    if when <= now:
+        when += timedelta(days=1)
+    return when
+
+
+# Process-wide scheduler. Signals only touch it while it is running in this process.
+scheduler = HeapScheduler()
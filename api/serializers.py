@@ -1,9 +1,10 @@
 from django.contrib.auth.models import Group, User
-from api.models import Notice, Routine, Profile, AdmissionRecord, Event, DeviceToken, PasswordResetCode
+from api.models import Notice, NoticeAttachment, Routine, Profile, AdmissionRecord, Event, DeviceToken, PasswordResetCode
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.utils import timezone
 from datetime import timedelta, datetime
 from django.utils.crypto import get_random_string
@@ -11,9 +12,41 @@ from django.core.mail import send_mail
 from django.conf import settings
 
 from django.db import transaction
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.reverse import reverse
 
 from .utils import send_reset_email_async
+from .timetable import build_timetable, find_routine_clashes, lock_routine_semesters
+from .authentication import CampusRefreshToken
+
+
+# -------------------- SPARSE FIELDSETS --------------------
+class DynamicFieldsMixin:
+    """
+    Lets clients trim a response with query params:
+    - ?fields=id,title   only return these fields
+    - ?omit=content      return everything except these fields
+    Only applies to the top-level serializer of a GET request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+
+        fields = request.query_params.get("fields")
+        omit = request.query_params.get("omit")
+
+        if fields:
+            allowed = {name.strip() for name in fields.split(",") if name.strip()}
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+        if omit:
+            for name in omit.split(","):
+                self.fields.pop(name.strip(), None)
 
 
 
@@ -69,7 +102,7 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 
 # -------------------- USERS --------------------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     profile = ProfileSerializer(read_only=True)     
 
     class Meta:
@@ -122,12 +155,8 @@ class EmailLoginSerializer(serializers.Serializer):
         password = attrs.get('password')
 
         if email and password:
-            try:
-                user_obj = User.objects.get(email=email)
-            except User.DoesNotExist:
-                raise serializers.ValidationError("No user with this email found.")
-
-            user = authenticate(username=user_obj.username, password=password)
+            # One indexed lookup + one password check (see api/backends.py)
+            user = authenticate(self.context.get("request"), email=email, password=password)
             if not user:
                 raise serializers.ValidationError("Invalid email or password.")
 
@@ -137,6 +166,16 @@ class EmailLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Email and password are required.")
 
 
+class CampusTokenRefreshSerializer(TokenRefreshSerializer):
+    """Token refresh that checks the blacklist in memory first (see api/blacklist.py)."""
+    token_class = CampusRefreshToken
+
+
+# -------------------- DEVICES --------------------
+class DeviceTokenSerializer(serializers.Serializer):
+    token = serializers.CharField(max_length=255)
+
+
 # -------------------- GROUPS --------------------
 class GroupSerializer(serializers.ModelSerializer):
     class Meta:
@@ -145,8 +184,25 @@ class GroupSerializer(serializers.ModelSerializer):
 
 
 # -------------------- NOTICES --------------------
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeAttachmentSerializer(serializers.ModelSerializer):
+    """Attachment metadata; `url` is the content-hashed download link."""
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NoticeAttachment
+        fields = ['id', 'original_name', 'content_type', 'size', 'sha256', 'url', 'created']
+
+    def get_url(self, obj):
+        return reverse(
+            'attachment-download',
+            kwargs={'pk': obj.pk, 'sha256': obj.sha256},
+            request=self.context.get('request'),
+        )
+
+
+class NoticeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     featured_image = serializers.ImageField(use_url=True)
+    attachments = NoticeAttachmentSerializer(many=True, read_only=True)
 
     class Meta:
         model = Notice
@@ -156,11 +212,13 @@ class NoticeSerializer(serializers.ModelSerializer):
             'content',
             'featured_image',
             'author',
+            'semester',
             'published_at',
+            'attachments',
         ]
         extra_kwargs = {
             "author": {"read_only": True},
-            "published_at": {"read_only": True},
+            "published_at": {"required": False, "allow_null": True},
         }
 
     def validate(self, data):
@@ -168,19 +226,150 @@ class NoticeSerializer(serializers.ModelSerializer):
         return data
 
 
+class NoticeListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact notice used by the list endpoint.
+    `excerpt` is annotated in SQL by NoticeViewSet, so `content` is never loaded.
+    """
+    featured_image = serializers.ImageField(use_url=True, read_only=True)
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Notice
+        fields = [
+            'id',
+            'title',
+            'excerpt',
+            'featured_image',
+            'author',
+            'semester',
+            'published_at',
+        ]
+        read_only_fields = fields
+
+
 # -------------------- ROUTINES --------------------
-class RoutineSerializer(serializers.ModelSerializer):
+class RoutineClashError(APIException):
+    """
+    400 listing clashing classes. Not a ValidationError: DRF turns every value of
+    those into a string, and clients match `index`/`id` as numbers.
+    """
+    status_code = 400
+    default_code = "routine_clash"
+
+    def __init__(self, conflicts):
+        super().__init__()
+        self.detail = {"conflicts": conflicts}
+
+
+class RoutineListSerializer(serializers.ListSerializer):
+    """
+    Bulk routine upload.
+    - Every clash (new vs new and new vs existing) is reported in one response.
+    - All rows are inserted with a single bulk_create in one transaction.
+    - Clashes are checked again inside that transaction, after locking the
+      semesters (lock_routine_semesters), so two uploads running at the same
+      time cannot both pass, even into an empty semester.
+    """
+
+    def validate(self, attrs):
+        conflicts = find_routine_clashes(attrs)
+        if conflicts:
+            raise RoutineClashError(conflicts)
+        return attrs
+
+    def create(self, validated_data):
+        routines = [Routine(**item) for item in validated_data]
+        for routine in routines:
+            routine.day_ordinal = Routine.ordinal_for(routine.day)  # save() is not called by bulk_create
+
+        with transaction.atomic():
+            lock_routine_semesters(item["semester"] for item in validated_data)
+            conflicts = find_routine_clashes(validated_data)
+            if conflicts:
+                raise RoutineClashError(conflicts)
+            routines = Routine.objects.bulk_create(routines)
+            # bulk_create sends no post_save, so refresh the cached timetables here
+            for semester in {routine.semester for routine in routines}:
+                transaction.on_commit(lambda semester=semester: build_timetable(semester))
+        return routines
+
+
+class RoutineSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Routine
         fields = '__all__'
+        list_serializer_class = RoutineListSerializer
+
+    def validate(self, attrs):
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        if start_time and end_time and start_time >= end_time:
+            raise ValidationError({"end_time": "End time must be after start time."})
+
+        # Bulk uploads are checked once for the whole list in RoutineListSerializer
+        if self.parent is None:
+            self._check_clashes(attrs)
+        return attrs
 
+    # The check in validate() runs outside any transaction, so create/update
+    # repeat it with the semester locked before writing.
+    def create(self, validated_data):
+        with transaction.atomic():
+            lock_routine_semesters([validated_data['semester']])
+            self._check_clashes(validated_data)
+            return super().create(validated_data)
 
-class EventSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            lock_routine_semesters([instance.semester, validated_data.get('semester', instance.semester)])
+            self._check_clashes(validated_data)
+            return super().update(instance, validated_data)
+
+    def _check_clashes(self, attrs):
+        slot = {
+            field: attrs.get(field, getattr(self.instance, field, None))
+            for field in ('semester', 'day', 'subject', 'start_time', 'end_time')
+        }
+        conflicts = find_routine_clashes([slot], exclude_pk=getattr(self.instance, 'pk', None))
+        if conflicts:
+            raise RoutineClashError(conflicts)
+
+
+class EventSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
 
 
+class EventListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact event used by the list endpoint.
+    `excerpt` is annotated in SQL by EventViewSet, so `event_detail` is never loaded.
+    """
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Event
+        exclude = ['event_detail']
+        read_only_fields = ['id', 'event_title', 'event_date', 'start_time', 'end_time', 'location', 'image']
+
+
+# -------------------- INBOX --------------------
+class InboxReadSerializer(serializers.Serializer):
+    """
+    Either {"all": true} or {"type": "notice", "ids": [1, 2]}.
+    """
+    all = serializers.BooleanField(default=False)
+    type = serializers.ChoiceField(choices=['notice', 'event'], required=False)
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=500)
+
+    def validate(self, attrs):
+        if not attrs['all'] and not (attrs.get('type') and attrs.get('ids')):
+            raise serializers.ValidationError("Send either all=true or a type with ids.")
+        return attrs
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True, required=True)
     new_password = serializers.CharField(write_only=True, required=True)
@@ -1,11 +1,20 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import Event, Notice, AdmissionRecord, Profile
+from .models import Event, Notice, AdmissionRecord, Profile, Routine
 from .utils import send_fcm_to_all
+from .publishing import PUBLISH_JOB, schedule_notice
+from .reminders import schedule_event_reminders, cancel_event_reminders
+from .scheduler import scheduler
+from .timetable import build_timetable, forget_user_semester
+from .inbox import count_published, reset_badge_counters
+from .live import hub
+from .backends import users_by_email
+from .authentication import forget_version
 from django.contrib.auth.models import User
 from django.utils.crypto import get_random_string
 from django.core.mail import send_mail
 from django.conf import settings
+from django.utils import timezone
 
 import traceback
 
@@ -25,19 +34,135 @@ def notify_on_event_create(sender, instance, created, **kwargs):
         )
 
 
+@receiver(post_save, sender=Event)
+def count_new_event(sender, instance, created, **kwargs):
+    """
+    Keeps the cached unread-badge counters in step (see api/inbox.py).
+    """
+    if created:
+        count_published()
+
+
+@receiver(post_delete, sender=Event)
+def uncount_deleted_event(sender, instance, **kwargs):
+    count_published(delta=-1)
+
+
+def _is_visible(notice):
+    return notice.published_at is not None and notice.published_at <= timezone.now()
+
+
+@receiver(post_save, sender=Notice)
+def recount_edited_notice(sender, instance, created, **kwargs):
+    # An edit can change the audience or publish time of a visible notice
+    if not created and _is_visible(instance):
+        reset_badge_counters()
+
+
+@receiver(post_delete, sender=Notice)
+def uncount_deleted_notice(sender, instance, **kwargs):
+    if _is_visible(instance):
+        count_published(instance.semester, delta=-1)
+
+
+@receiver(post_save, sender=Event)
+def reschedule_event_reminders(sender, instance, **kwargs):
+    """
+    Keeps the reminder scheduler's heap in step with event edits.
+    """
+    schedule_event_reminders(instance)
+
+
+@receiver(post_delete, sender=Event)
+def drop_event_reminders(sender, instance, **kwargs):
+    cancel_event_reminders(instance.pk)
+
+
+@receiver(post_save, sender=Event)
+def publish_event_live(sender, instance, created, **kwargs):
+    """
+    Feeds the SSE live stream (api/live.py). New notices are published there
+    when they are pushed (see publish_notices), not when saved.
+    """
+    hub.publish("event", instance.pk, "created" if created else "updated")
+
+
+@receiver(post_delete, sender=Event)
+def publish_event_deleted(sender, instance, **kwargs):
+    hub.publish("event", instance.pk, "deleted")
+
+
+@receiver(post_save, sender=Notice)
+def publish_notice_edit_live(sender, instance, created, **kwargs):
+    if not created and instance.notified_at is not None:
+        hub.publish("notice", instance.pk, "updated", instance.semester)
+
+
+@receiver(post_delete, sender=Notice)
+def publish_notice_deleted(sender, instance, **kwargs):
+    if _is_visible(instance):
+        hub.publish("notice", instance.pk, "deleted", instance.semester)
+
+
 @receiver(post_save, sender=Notice)
 def notify_on_notice_create(sender, instance, created, **kwargs):
     """
-    Sends a push notification to all devices when a new Notice is created.
+    Sends a push notification to all devices once a Notice is published.
+    Notices with a future `published_at` are queued on the publish scheduler instead.
     """
-    if created:
-        send_fcm_to_all(
-            title=f"New Notice: {instance.title}",
-            body=f"{instance.body[:100]}..." if hasattr(instance, "body") and instance.body else "Tap to view details.",
-            data={"notice_id": str(instance.id)}
+    schedule_notice(instance)
+
+
+@receiver(post_delete, sender=Notice)
+def cancel_notice_publish(sender, instance, **kwargs):
+    scheduler.cancel(PUBLISH_JOB, instance.pk)
+
+
+
+
+
+# -------------------- Timetable cache --------------------
+@receiver(pre_save, sender=Routine)
+def remember_routine_semester(sender, instance, **kwargs):
+    # Needed to rebuild the old semester too when a routine moves between semesters
+    if instance.pk:
+        instance._previous_semester = (
+            Routine.objects.filter(pk=instance.pk).values_list("semester", flat=True).first()
         )
 
 
+@receiver(post_save, sender=Routine)
+def rebuild_timetable_on_save(sender, instance, **kwargs):
+    """
+    Rebuilds the cached weekly timetable of the affected semester(s).
+    """
+    build_timetable(instance.semester)
+    previous = getattr(instance, "_previous_semester", None)
+    if previous and previous != instance.semester:
+        build_timetable(previous)
+
+
+@receiver(post_delete, sender=Routine)
+def rebuild_timetable_on_delete(sender, instance, **kwargs):
+    build_timetable(instance.semester)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def forget_cached_semester(sender, instance, **kwargs):
+    forget_user_semester(instance.user_id)
+    forget_version(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_token_claims_version(sender, instance, **kwargs):
+    """
+    Tokens whose claims no longer match the user fall back to a database lookup.
+    """
+    forget_version(instance.pk)
+
+
 
 
 
@@ -64,7 +189,7 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
             counter += 1
 
         # Check if a user already exists with this email
-        user = User.objects.filter(email=instance.email).first()
+        user = users_by_email(instance.email).first()
 
         if not user:
             # Generate random temporary password
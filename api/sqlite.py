@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# -------------------- SQLITE PRODUCTION PROFILE --------------------
+# Applied to every new SQLite connection (see SQLITE_PRAGMAS in settings):
+# WAL lets readers run while a write is in progress, busy_timeout makes writers
+# queue instead of failing with "database is locked", and the cache/mmap sizes
+# keep hot pages in memory. With CONN_MAX_AGE this runs once per connection,
+# not once per request.
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,64 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+# -------------------- AUTH ENDPOINT RATE LIMITS --------------------
+# Sliding-window limits (DRF keeps the timestamps of recent requests per key)
+# for the AllowAny auth endpoints, checked in APIView.initial() before the view
+# hashes a password, queries a user or sends an email.
+# A view opts in with `throttle_scope = "login"`; rates come from
+# REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] as "<scope>_ip" and "<scope>_email".
+# Counters live in the RATELIMIT_CACHE_ALIAS cache (see CACHES in settings).
+
+
+class ScopedAuthThrottle(SimpleRateThrottle):
+    key_kind = None  # "ip" or "email"
+
+    def __init__(self):
+        # Rate depends on the view's scope, so it is resolved in allow_request
+        pass
+
+    @property
+    def cache(self):
+        return caches[settings.RATELIMIT_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        self.scope = f"{scope}_{self.key_kind}"
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope) if scope else None
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request)
+        if not ident:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class IPRateThrottle(ScopedAuthThrottle):
+    """Limits one client address (REMOTE_ADDR; behind proxies set CAMPUS_NUM_PROXIES)."""
+    key_kind = "ip"
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class EmailRateThrottle(ScopedAuthThrottle):
+    """Limits attempts against one account, whichever addresses they come from."""
+    key_kind = "email"
+
+    def get_ident_key(self, request):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha1(email.strip().lower().encode()).hexdigest()
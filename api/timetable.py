@@ -0,0 +1,239 @@
+import hashlib
+import json
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Profile, Routine, RoutineSemesterLock
+
+
+# -------------------- WEEKLY TIMETABLE CACHE --------------------
+# Every student of a semester sees the same timetable, so it is built once per
+# semester as a ready-to-send JSON blob and rebuilt when a Routine changes.
+# Signals only reach the cache of the process that saved the Routine/Profile, so
+# with a per-process cache (LocMemCache) and several workers the entries also
+# expire after TIMETABLE_CACHE_SECONDS: the other workers catch up within that time.
+
+TIMETABLE_CACHE_KEY = "timetable:{semester}"
+USER_SEMESTER_CACHE_KEY = "profile_semester:{user_id}"
+
+
+def build_timetable(semester):
+    """
+    Build the timetable blob for one semester and store it in the cache.
+    Returns (etag, body) where body is compact JSON grouped by day and sorted by start time.
+    """
+    semester = str(semester)
+    days = {day: [] for day, _label in Routine.DAYS_OF_WEEK}
+
+    rows = (
+        Routine.objects.filter(semester=semester)
+        .order_by("day_ordinal", "start_time")
+        .values_list("id", "day", "subject", "start_time", "end_time")
+    )
+    for routine_id, day, subject, start_time, end_time in rows:
+        days.setdefault(day, []).append({
+            "id": routine_id,
+            "subject": subject,
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+        })
+
+    body = json.dumps(
+        {"semester": semester, "days": days}, separators=(",", ":")
+    ).encode()
+    etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+    cache.set(TIMETABLE_CACHE_KEY.format(semester=semester), (etag, body), timeout=settings.TIMETABLE_CACHE_SECONDS)
+    return etag, body
+
+
+def get_timetable(semester):
+    """Return (etag, body) for a semester, building it on a cache miss."""
+    cached = cache.get(TIMETABLE_CACHE_KEY.format(semester=semester))
+    if cached is None:
+        cached = build_timetable(semester)
+    return cached
+
+
+# -------------------- NOW / NEXT CLASS --------------------
+class WeekIntervals:
+    """
+    Per-semester interval index: for each weekday, start times sorted for bisect.
+    Built from the cached timetable blob, so answering needs no database query.
+    Classes of one semester never overlap (see find_routine_clashes), so the class
+    starting last before `at` is the only one that can be running.
+    """
+
+    def __init__(self, etag, body):
+        self.etag = etag
+        self.days = {}  # day_ordinal -> (starts, slots)
+        for day, slots in json.loads(body)["days"].items():
+            ordinal = Routine.ordinal_for(day)
+            if ordinal is None or not slots:
+                continue
+            slots = [
+                {**slot, "day": day, "_start": time.fromisoformat(slot["start_time"]),
+                 "_end": time.fromisoformat(slot["end_time"])}
+                for slot in slots
+            ]
+            self.days[ordinal] = ([slot["_start"] for slot in slots], slots)
+
+    def now_and_next(self, day_ordinal, at):
+        """Return (current, next) slots for a weekday ordinal and a time of day. O(log n)."""
+        starts, slots = self.days.get(day_ordinal, ((), ()))
+        index = bisect_right(starts, at) - 1
+
+        current = None
+        if index >= 0 and slots[index]["_end"] > at:
+            current = slots[index]
+
+        upcoming = slots[index + 1] if index + 1 < len(slots) else None
+        offset = 1
+        while upcoming is None and offset <= 7:
+            # Nothing left today: first class of the next day that has any
+            later = self.days.get((day_ordinal + offset) % 7)
+            if later:
+                upcoming = later[1][0]
+            offset += 1
+
+        return _public_slot(current), _public_slot(upcoming)
+
+
+def _public_slot(slot):
+    if slot is None:
+        return None
+    return {key: value for key, value in slot.items() if not key.startswith("_")}
+
+
+# Process-local indexes, rebuilt whenever the cached blob's etag changes
+_week_intervals = {}
+
+
+def get_week_intervals(semester):
+    semester = str(semester)
+    etag, body = get_timetable(semester)
+    intervals = _week_intervals.get(semester)
+    if intervals is None or intervals.etag != etag:
+        intervals = WeekIntervals(etag, body)
+        _week_intervals[semester] = intervals
+    return intervals
+
+
+def current_and_next_class(semester, now=None):
+    now = timezone.localtime(now)
+    day_ordinal = Routine.ordinal_for_date(now)
+    current, upcoming = get_week_intervals(semester).now_and_next(day_ordinal, now.time())
+    return {
+        "semester": str(semester),
+        "now": now.isoformat(),
+        "current": current,
+        "next": upcoming,
+    }
+
+
+def get_user_semester(user):
+    """
+    Semester of a student, cached so the timetable never needs a Profile query.
+    Users authenticated from token claims already carry it (api/authentication.py).
+    Returns None for users without a profile.
+    """
+    if getattr(user, "from_token", False):
+        return user.semester
+
+    key = USER_SEMESTER_CACHE_KEY.format(user_id=user.pk)
+    semester = cache.get(key)
+    if semester is None:
+        semester = Profile.objects.filter(user_id=user.pk).values_list("semester", flat=True).first()
+        if semester is None:
+            return None
+        cache.set(key, semester, timeout=settings.TIMETABLE_CACHE_SECONDS)
+    return str(semester)
+
+
+def forget_user_semester(user_id):
+    cache.delete(USER_SEMESTER_CACHE_KEY.format(user_id=user_id))
+
+
+# -------------------- CLASH DETECTION --------------------
+def find_routine_clashes(items, exclude_pk=None):
+    """
+    Find overlapping classes for new routine rows.
+    `items` are validated dicts (semester, day, subject, start_time, end_time).
+
+    Existing rows of the same semesters/days are loaded in one query, then each
+    (semester, day) group is sorted by start time and swept once, comparing every
+    class with the one that ends last so far. Clashes only between existing rows
+    are not reported.
+    """
+    groups = defaultdict(list)
+    for index, item in enumerate(items):
+        key = (str(item["semester"]), Routine.ordinal_for(item["day"]))
+        groups[key].append({"index": index, **item})
+
+    if not groups:
+        return []
+
+    existing = Routine.objects.filter(
+        semester__in={semester for semester, _ordinal in groups},
+        day_ordinal__in={ordinal for _semester, ordinal in groups},
+    )
+    if exclude_pk is not None:
+        existing = existing.exclude(pk=exclude_pk)
+
+    for row in existing.values("id", "semester", "day", "day_ordinal", "subject", "start_time", "end_time"):
+        key = (row["semester"], row.pop("day_ordinal"))
+        if key in groups:
+            groups[key].append(row)
+
+    conflicts = []
+    for slots in groups.values():
+        slots.sort(key=lambda slot: (slot["start_time"], slot["end_time"]))
+        latest = None
+        for slot in slots:
+            if latest is not None and slot["start_time"] < latest["end_time"]:
+                if "index" in slot or "index" in latest:
+                    conflicts.append({**_describe_slot(slot), "clashes_with": _describe_slot(latest)})
+            if latest is None or slot["end_time"] > latest["end_time"]:
+                latest = slot
+
+    conflicts.sort(key=lambda conflict: conflict.get("index", conflict["clashes_with"].get("index")))
+    return conflicts
+
+
+def lock_routine_semesters(semesters):
+    """
+    Serialize routine writes per semester. Call inside transaction.atomic(),
+    before re-checking clashes; the lock is held until the transaction ends.
+    - The lock rows are created on first use, so an empty semester is covered too.
+    - Each row is locked with an UPDATE: a row lock on PostgreSQL/MySQL, the
+      database write lock on SQLite.
+    - Semesters are locked in sorted order so two bulk uploads cannot deadlock.
+    """
+    semesters = sorted({str(semester) for semester in semesters})
+    RoutineSemesterLock.objects.bulk_create(
+        [RoutineSemesterLock(semester=semester) for semester in semesters],
+        ignore_conflicts=True,
+    )
+    now = timezone.now()
+    for semester in semesters:
+        RoutineSemesterLock.objects.filter(semester=semester).update(locked_at=now)
+
+
+def _describe_slot(slot):
+    described = {
+        "semester": str(slot["semester"]),
+        "day": slot["day"],
+        "subject": slot["subject"],
+        "start_time": slot["start_time"].isoformat(),
+        "end_time": slot["end_time"].isoformat(),
+    }
+    if "index" in slot:
+        described["index"] = slot["index"]
+    else:
+        described["id"] = slot["id"]
+    return described
@@ -6,7 +6,7 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 
-from api import views
+from api import async_views, views
 
 
 #the r in this means raw data and tyo hale pani hunxa na hale pani
@@ -34,6 +34,11 @@ def custom_api_root(request, format=None):
         "routines": reverse('routine-list', request=request, format=format),
         "events": reverse('event-list', request=request, format=format),
         "admission-records": reverse('admissionrecord-list', request=request, format=format),
+        "live": reverse('live-feed', request=request, format=format),
+        "calendar": {
+            "events": reverse('event-calendar', request=request),
+            # per semester: /api/calendar/routines/<semester>.ics
+        },
         "auth": {
             # "register": reverse('register', request=request, format=format),
             "login": reverse('login', request=request, format=format),   # custom email login
@@ -41,6 +46,11 @@ def custom_api_root(request, format=None):
             "change_password": reverse('change_password', request=request, format=format),
             "token_refresh": reverse('token_refresh', request=request, format=format),
             "profile": reverse('profile', request=request, format=format),
+            "inbox": reverse('inbox', request=request, format=format),
+            "inbox_read": reverse('inbox-read', request=request, format=format),
+            "unread_count": reverse('unread-count', request=request, format=format),
+            "device_register": reverse('device-register', request=request, format=format),
+            "device_heartbeat": reverse('device-heartbeat', request=request, format=format),
             "send_notice": reverse('send-notice', request=request, format=format),
 
             # ------------------ NEW: Forgot/Reset Password ------------------
@@ -63,6 +73,24 @@ urlpatterns = [
     path('', include(router.urls)),         # main api endpoints
     
 
+    # iCalendar feeds for phone calendar apps
+    path('calendar/routines/<int:semester>.ics', views.routine_calendar_feed, name='routine-calendar'),
+    path('calendar/events.ics', views.event_calendar_feed, name='event-calendar'),
+
+    # Notice attachment downloads (content-hashed, resumable)
+    path('attachments/<int:pk>/<str:sha256>/', views.AttachmentDownloadView.as_view(), name='attachment-download'),
+
+    # Async (ASGI) read-only twins of the busiest GET endpoints
+    path('async/notices/', async_views.notice_list, name='async-notice-list'),
+    path('async/notices/<int:pk>/', async_views.notice_detail, name='async-notice-detail'),
+    path('async/events/', async_views.event_list, name='async-event-list'),
+    path('async/events/<int:pk>/', async_views.event_detail, name='async-event-detail'),
+    path('async/routines/', async_views.routine_list, name='async-routine-list'),
+    path('async/profile/', async_views.profile_detail, name='async-profile'),
+
+    # Server-Sent Events stream of new/updated notices and events (run under ASGI)
+    path('live/', views.live_feed, name='live-feed'),
+
     # Authentication endpoints: /api/auth/
     # path('auth/register/', views.RegisterView.as_view(), name='register'),
     path('auth/login/', views.LoginView.as_view(), name='login'),   # use custom login
@@ -72,6 +100,11 @@ urlpatterns = [
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),  # login
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),  # refresh token
     path('auth/profile/', views.ProfileView.as_view(), name='profile'),
+    path('auth/inbox/', views.InboxView.as_view(), name='inbox'),
+    path('auth/inbox/read/', views.InboxReadView.as_view(), name='inbox-read'),
+    path('auth/unread-count/', views.UnreadCountView.as_view(), name='unread-count'),
+    path('auth/devices/', views.DeviceRegisterView.as_view(), name='device-register'),
+    path('auth/devices/heartbeat/', views.DeviceHeartbeatView.as_view(), name='device-heartbeat'),
     # Send notification endpoint
     path('auth/send-notice/', views.send_notice_notification, name='send-notice'),
 
@@ -127,6 +127,35 @@ def send_fcm_to_all(title, body, data=None):
     return {"success_count": success_count, "failure_count": failure_count}
 
 
+def send_fcm_multicast(tokens, title, body, data=None):
+    """
+    Send the same message to a list of device tokens, 500 per request
+    (the FCM multicast limit) instead of one request per device.
+    """
+    tokens = list(tokens)
+    if not tokens:
+        return {"success_count": 0, "failure_count": 0}
+
+    success_count = 0
+    failure_count = 0
+
+    for i in range(0, len(tokens), 500):
+        message = messaging.MulticastMessage(
+            notification=messaging.Notification(title=title, body=body),
+            tokens=tokens[i:i + 500],
+            data=data or {}
+        )
+        try:
+            response = messaging.send_each_for_multicast(message)
+            success_count += response.success_count
+            failure_count += response.failure_count
+        except Exception as e:
+            print(f"Error sending multicast FCM: {e}")
+            failure_count += len(message.tokens)
+
+    return {"success_count": success_count, "failure_count": failure_count}
+
+
 
 
 
@@ -6,12 +6,16 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ValidationError
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.db.models import Q  
+from django.db.models.functions import Substr
 from rest_framework.decorators import api_view, permission_classes, action
 from .utils import send_fcm_notification
 from rest_framework.generics import GenericAPIView
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import condition, require_safe
 
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
@@ -20,15 +24,31 @@ from django.contrib import messages
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 
-from api.serializers import GroupSerializer, UserSerializer, NoticeSerializer, RoutineSerializer, ProfileSerializer, EmailLoginSerializer, EventSerializer, ChangePasswordSerializer, AdmissionRecordSerializer, ForgotPasswordSerializer, ResetPasswordSerializer, ResetPasswordSerializer  #, RegisterSerializer, ResendCodeSerializer
+from api.serializers import GroupSerializer, UserSerializer, NoticeSerializer, NoticeListSerializer, NoticeAttachmentSerializer, RoutineSerializer, ProfileSerializer, EmailLoginSerializer, EventSerializer, EventListSerializer, InboxReadSerializer, DeviceTokenSerializer, ChangePasswordSerializer, AdmissionRecordSerializer, ForgotPasswordSerializer, ResetPasswordSerializer, ResetPasswordSerializer  #, RegisterSerializer, ResendCodeSerializer
 
-from .models import Notice, Routine, Profile, DeviceToken, Event, AdmissionRecord
+from .models import Notice, NoticeAttachment, Routine, Profile, DeviceToken, Event, AdmissionRecord
 from .permissions import IsAdminUser, ReadOnly
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser #later added
+from .timetable import get_timetable, get_user_semester, current_and_next_class
+from .ical import routine_calendar, routine_etag, event_calendar, event_etag
+from .inbox import inbox_items, parse_cursor, mark_read, mark_all_read, unread_count
+from .live import hub, is_visible, format_sse
+from .downloads import ranged_file_response
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from .authentication import CampusRefreshToken, ClaimsJWTAuthentication
+from .throttling import IPRateThrottle, EmailRateThrottle
+from .devices import register_device, heartbeats
+from .renderers import FastJSONParser
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.parsers import MultiPartParser, FormParser #later added
 # from NOTICE.firebase_config import firebase_admin
 # from firebase_admin import messaging
 
 
+# Length of the `excerpt` sent in notice/event list responses
+EXCERPT_LENGTH = 200
+
 
 class UserViewSet(viewsets.ModelViewSet):
     """
@@ -52,11 +72,111 @@ class GroupViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
 
 
+# -------------------- SHARED QUERYSET FILTERS --------------------
+# Used by the viewsets below and by the async views (api/async_views.py).
+# They only build querysets, so they are safe to call from async code.
+
+def visible_notices(queryset, semester, is_staff, search_term=None):
+    """Published notices for this audience, optionally searched by title/content."""
+    queryset = queryset.filter(published_at__lte=timezone.now())
+    if not is_staff:
+        queryset = queryset.filter(Q(semester__isnull=True) | Q(semester=semester))
+
+    if search_term:
+        # search by title and content (case-insensitive)
+        queryset = queryset.filter(
+            Q(title__icontains=search_term) | Q(content__icontains=search_term)
+        )
+    return queryset
+
+
+def notice_list_fields(queryset):
+    # Cut the excerpt in SQL so the full content never leaves the database
+    return queryset.only(
+        "id", "title", "featured_image", "author", "semester", "published_at"
+    ).annotate(excerpt=Substr("content", 1, EXCERPT_LENGTH))
+
+
+def event_list_fields(queryset):
+    return queryset.defer("event_detail").annotate(
+        excerpt=Substr("event_detail", 1, EXCERPT_LENGTH)
+    )
+
+
+def _date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValidationError({name: "Use the YYYY-MM-DD format."})
+    return parsed
+
+
+def _limit_param(params, default=20, maximum=100):
+    """?limit= clamped to 1..maximum."""
+    try:
+        limit = int(params.get("limit", default))
+    except ValueError:
+        raise ValidationError({"limit": "Must be a number."})
+    return max(1, min(limit, maximum))
+
+
+def filter_events(queryset, params):
+    """?from= / ?to= date range; past events are hidden unless ?include_past=true or ?from=."""
+    date_from = _date_param(params, "from")
+    date_to = _date_param(params, "to")
+    include_past = params.get("include_past", "").lower() in ["1", "true"]
+
+    # Past events are archived out of the default list
+    if date_from is None and not include_past:
+        date_from = timezone.localdate()
+    if date_from:
+        queryset = queryset.filter(event_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(event_date__lte=date_to)
+    return queryset
+
+
+def filter_routines(queryset, user, semester, params):
+    """
+    Students only see their own semester (`semester` None = no profile, no data).
+    ?day= filters by weekday, ?semester= by semester (admins only).
+    """
+    if user.is_authenticated and not user.is_staff:
+        if semester is None:
+            return queryset.none()
+        queryset = queryset.filter(semester=semester)
+
+    # Optional: filter by day (for dropdown in Flutter)
+    day = params.get("day", None)
+    if day:
+        day_ordinal = Routine.ordinal_for(day)
+        if day_ordinal is None:
+            return queryset.none()
+        queryset = queryset.filter(day_ordinal=day_ordinal)
+
+    # Filter by semester query param (admins only)
+    requested = params.get("semester", None)
+    if requested and user.is_staff:
+        queryset = queryset.filter(semester=str(requested))
+
+    # Always return ordered by weekday and time (matches the semester/day/time index)
+    return queryset.order_by('day_ordinal', 'start_time')
+
+
 class NoticeViewSet(viewsets.ModelViewSet):
     """
     API endpoint for managing Notices.
     - Anyone can read published notices.
     - Only admin can create, update, or delete.
+    - A future `published_at` schedules the notice; it stays hidden until then.
+      The push goes out at `published_at`, or up to SCHEDULER_RESYNC_SECONDS (5 min)
+      later when the scheduler runs as a separate `runscheduler` process.
+    - A notice with a `semester` is only shown to that semester's students.
+    - List returns a short `excerpt` instead of the full `content`.
+    - Optional: ?fields=id,title or ?omit=featured_image to trim the response.
+    - Detail includes `attachments`; admins upload files with POST /notices/<id>/attachments/.
     """
 
     queryset = Notice.objects.all().order_by("-published_at")
@@ -67,26 +187,43 @@ class NoticeViewSet(viewsets.ModelViewSet):
             return [ReadOnly()]
         return [IsAdminUser()]
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return NoticeListSerializer
+        return NoticeSerializer
+
     def get_queryset(self):
         queryset = super().get_queryset()
         if self.action in ["list", "retrieve"]:
-            queryset = queryset.filter(published_at__isnull=False)
-
-            #search start:
-            
-            search_term = self.request.query_params.get("query", None)
-            if search_term:
-                # search by title and content (case-insensitive)
-                queryset = queryset.filter(
-                    Q(title_icontains=search_term) | Q(content_icontains=search_term)
-                )
-            #search end
+            user = self.request.user
+            semester = get_user_semester(user) if user.is_authenticated and not user.is_staff else None
+            queryset = visible_notices(
+                queryset, semester, user.is_staff, self.request.query_params.get("query")
+            )
+
+        if self.action == "list":
+            queryset = notice_list_fields(queryset)
+        elif self.action == "retrieve":
+            queryset = queryset.prefetch_related("attachments")
         return queryset
+
+    @action(detail=True, methods=["post"], parser_classes=[MultiPartParser, FormParser])
+    def attachments(self, request, pk=None):
+        """Attach one or more files (multipart field `file`) to a notice. Admin only."""
+        notice = self.get_object()
+        files = request.FILES.getlist("file")
+        if not files:
+            return Response({"error": "Send at least one file in the `file` field."}, status=status.HTTP_400_BAD_REQUEST)
+
+        attachments = [NoticeAttachment.objects.create(notice=notice, file=upload) for upload in files]
+        serializer = NoticeAttachmentSerializer(attachments, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     def perform_create(self, serializer):
         serializer.save(
             author=self.request.user,
-            published_at=timezone.now()  # Auto-publish the notice
+            # Auto-publish the notice unless a future time was given
+            published_at=serializer.validated_data.get("published_at") or timezone.now()
     )
         
 
@@ -98,14 +235,17 @@ class RoutineViewSet(viewsets.ModelViewSet):
     - Anyone can read routines.
     - Only admin can create, update, or delete.
     - Optional: filter by day (e.g., ?day=Monday)
+    - Optional: ?fields= / ?omit= to trim the response.
+    - /routines/timetable/ serves the cached weekly timetable of the user's semester.
+    - /routines/current/ answers "which class now, and which next" from memory.
     """
 
-    queryset = Routine.objects.all().order_by('day', 'start_time')
+    queryset = Routine.objects.all().order_by('day_ordinal', 'start_time')
     serializer_class = RoutineSerializer
     # permission_classes = [permissions.IsAuthenticated]  # default
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "timetable", "current"]:
             return [ReadOnly()]  # Anyone can see the routine
         return [permissions.IsAdminUser()]  # Only admin can edit
 
@@ -114,25 +254,10 @@ class RoutineViewSet(viewsets.ModelViewSet):
         user = self.request.user
 
         #  Filter where Normal users see only routines of their semester
+        semester = None
         if user.is_authenticated and not user.is_staff:
-            try:
-                profile = Profile.objects.get(user=user)
-                queryset = queryset.filter(semester=str(profile.semester))
-            except Profile.DoesNotExist:
-                queryset = queryset.none()  # no profile, no data
-
-        # Optional: filter by day (for dropdown in Flutter)
-        day = self.request.query_params.get("day", None)
-        if day:
-            queryset = queryset.filter(day__iexact=day)
-
-        # Filter by semester query param (admins only)
-        semester = self.request.query_params.get("semester", None)
-        if semester and user.is_staff:
-            queryset = queryset.filter(semester=str(semester))
-
-        # Always return ordered by day and time
-        return queryset.order_by('day', 'start_time')
+            semester = get_user_semester(user)
+        return filter_routines(queryset, user, semester, self.request.query_params)
 
     def create(self, request, *args, **kwargs):
         """
@@ -145,6 +270,57 @@ class RoutineViewSet(viewsets.ModelViewSet):
         self.perform_create(serializer)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    def _requested_semester(self, request):
+        """
+        Students always get their own semester.
+        Admins and anonymous users pass ?semester=5
+        Returns (semester, error_response).
+        """
+        user = request.user
+        if user.is_authenticated and not user.is_staff:
+            semester = get_user_semester(user)
+            if semester is None:
+                return None, Response({"error": "Profile not found for this user."}, status=status.HTTP_404_NOT_FOUND)
+            return semester, None
+
+        semester = request.query_params.get("semester")
+        if not semester:
+            return None, Response({"error": "semester is required."}, status=status.HTTP_400_BAD_REQUEST)
+        # Checked before anything is cached per semester
+        if not Routine.is_semester(semester):
+            return None, Response({"error": "semester must be between 1 and 8."}, status=status.HTTP_400_BAD_REQUEST)
+        return semester.strip(), None
+
+    @action(detail=False, methods=["get"])
+    def timetable(self, request):
+        """
+        Weekly timetable grouped by day and sorted by start time.
+        Served straight from the per-semester cache (see api/timetable.py).
+        """
+        semester, error = self._requested_semester(request)
+        if error:
+            return error
+
+        etag, body = get_timetable(semester)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(body, content_type="application/json")
+            # Same blob for every student of the semester: compress it once (api/compression.py)
+            response.compressed_cache_key = f"timetable:{semester}:{etag}"
+        response["ETag"] = etag
+        return response
+
+    @action(detail=False, methods=["get"])
+    def current(self, request):
+        """
+        The class running right now (or null) and the next one, possibly on a later day.
+        """
+        semester, error = self._requested_semester(request)
+        if error:
+            return error
+        return Response(current_and_next_class(semester))
+
 
 
     
@@ -160,7 +336,7 @@ class AdminAdmissionRecordViewSet(viewsets.ModelViewSet):
     queryset = AdmissionRecord.objects.all()
     serializer_class = AdmissionRecordSerializer
     permission_classes = [IsAdminUser]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    parser_classes = [MultiPartParser, FormParser, FastJSONParser]
 
     # @action(detail=False, methods=['post'], url_path='create-student', permission_classes=[IsAdminUser])
     def create(self, request, *args, **kwargs):
@@ -190,41 +366,30 @@ class LoginView(APIView):
     Accepts optional device_token from Flutter.
     Saves or updates it for the logged-in user.
     Returns JWT tokens.
+    Rate limited per client address and per email (api/throttling.py).
     """
     permission_classes = [AllowAny]
+    authentication_classes = []  # no auth work before the rate limit check
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "login"
     serializer_class = EmailLoginSerializer  #Important for browsable API form
 
     def post(self, request):
-        serializer = self.serializer_class(data=request.data)
+        # The serializer authenticates: one indexed email lookup + one password check
+        serializer = self.serializer_class(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
-        email = serializer.validated_data['email']
-        password = serializer.validated_data['password']
+        user = serializer.validated_data['user']
         device_token = request.data.get('fcm_token')  # ADDED for device token
 
-        # Authenticate using email
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
-
-        user = authenticate(username=user.username, password=password)
-        if user is None:
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
-
         # Save or update device token
         if device_token:
             # Prevent storing blank or invalid tokens
             if device_token.strip():
-                DeviceToken.objects.update_or_create(
-                    token=device_token.strip(),
-                    defaults={'user': user}
-                )
-
-        # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+                register_device(device_token.strip(), user.pk)
 
-        refresh = RefreshToken.for_user(user)
+        # Generate JWT tokens (with the claims read requests are served from)
+        refresh = CampusRefreshToken.for_user(user)
         return Response({
             "message": f"Logged in successfully! Welcome back, {user.username}.",
             "refresh": str(refresh),
@@ -246,10 +411,9 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     
     # Corrected one
     def get_object(self):
-        # Always fetch the logged-in user's profile
-        user = self.request.user
+        # Always fetch the logged-in user's profile (by id: no auth_user query needed)
         try:
-            return user.profile
+            return Profile.objects.get(user_id=self.request.user.pk)
         except Profile.DoesNotExist:
             raise NotFound("Profile not found for this user. Please register first.")
 
@@ -258,7 +422,7 @@ class ProfileView(generics.RetrieveUpdateAPIView):
         Override GET to return a clear error if profile is missing.
         """
         try:
-            profile = request.user.profile
+            profile = Profile.objects.get(user_id=request.user.pk)
         except Profile.DoesNotExist:
             return Response(
                 {"error": "Profile not found for this user. Please register first."},
@@ -288,7 +452,7 @@ class LogoutView(APIView):
             )
 
         try:
-            token = RefreshToken(refresh_token)
+            token = CampusRefreshToken(refresh_token)
             token.blacklist()
             return Response(
                 {"detail": "Successfully logged out."},
@@ -363,8 +527,12 @@ class EventViewSet(viewsets.ModelViewSet):
     API endpoint for managing Events.
     - Anyone can list or retrieve events.
     - Only admin can create, update, or delete.
+    - List returns a short `excerpt` instead of the full `event_detail`.
+    - List hides past events unless ?include_past=true or a ?from= date is given.
+    - Optional: ?from=2025-01-01&to=2025-01-31 date range (inclusive).
+    - /events/upcoming/ returns the next events in date/time order (?limit=, max 100).
     """
-    queryset = Event.objects.all()
+    queryset = Event.objects.all().order_by("event_date", "start_time")
     serializer_class = EventSerializer
 
     def get_permissions(self):
@@ -372,6 +540,290 @@ class EventViewSet(viewsets.ModelViewSet):
             return [IsAdminUser()]
         return [AllowAny()]
 
+    def get_serializer_class(self):
+        if self.action in ["list", "upcoming"]:
+            return EventListSerializer
+        return EventSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ["list", "upcoming"]:
+            queryset = event_list_fields(queryset)
+
+        if self.action == "list":
+            queryset = filter_events(queryset, self.request.query_params)
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def upcoming(self, request):
+        """
+        Events that have not ended yet, soonest first.
+        Uses the (event_date, start_time) index as a range scan from today.
+        """
+        limit = _limit_param(request.query_params)
+
+        now = timezone.localtime()
+        queryset = (
+            self.get_queryset()
+            .filter(event_date__gte=now.date())
+            .exclude(event_date=now.date(), end_time__lte=now.time())
+        )[:limit]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+# -------------------- CALENDAR FEEDS (.ics) --------------------
+# Plain Django views: calendar apps subscribe without tokens, and both feeds are
+# public data already (routines and events are readable by anyone).
+# ETag/If-None-Match is handled by @condition, so unchanged feeds cost a 304.
+
+def _routine_etag(request, semester):
+    if not Routine.is_semester(semester):
+        raise Http404("Unknown semester.")
+    return routine_etag(semester)
+
+
+@require_safe
+@condition(etag_func=_routine_etag)
+def routine_calendar_feed(request, semester):
+    """
+    Weekly routine of one semester, one recurring (RRULE) event per class.
+    """
+    response = StreamingHttpResponse(routine_calendar(semester), content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = f'inline; filename="semester-{semester}-routine.ics"'
+    return response
+
+
+@require_safe
+@condition(etag_func=lambda request: event_etag())
+def event_calendar_feed(request):
+    """
+    All events, streamed from the database.
+    """
+    response = StreamingHttpResponse(event_calendar(), content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = 'inline; filename="events.ics"'
+    return response
+
+
+# -------------------- ATTACHMENT DOWNLOADS --------------------
+class AttachmentDownloadView(APIView):
+    """
+    Download a notice attachment: /api/attachments/<id>/<sha256>/
+    - Streams the file; supports Range (resume a broken download) and If-Range.
+    - The URL changes with the file content, so responses are cached for a year.
+    - Same visibility rules as the notice it belongs to.
+    """
+    permission_classes = [ReadOnly]
+
+    def get(self, request, pk, sha256):
+        user = request.user
+        semester = get_user_semester(user) if user.is_authenticated and not user.is_staff else None
+        notices = visible_notices(Notice.objects.all(), semester, user.is_staff)
+        attachment = (
+            NoticeAttachment.objects.select_related("notice")
+            .filter(pk=pk, sha256=sha256, notice__in=notices.values("id"))
+            .first()
+        )
+        if attachment is None:
+            return Response({"error": "Attachment not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        response = ranged_file_response(
+            request,
+            lambda: attachment.file.open("rb"),
+            size=attachment.size,
+            etag=f'"{attachment.sha256}"',
+            content_type=attachment.content_type,
+            filename=attachment.original_name,
+            last_modified=attachment.created,
+        )
+        # Semester-only notices must not land in shared caches
+        scope = "public" if attachment.notice.semester is None else "private"
+        response["Cache-Control"] = f"{scope}, max-age=31536000, immutable"
+        return response
+
+
+# -------------------- INBOX --------------------
+class InboxView(APIView):
+    """
+    The logged-in user's notification inbox (notices + events), newest first.
+    - Items are derived from notices/events at read time, nothing is copied per user.
+    - Each item has `read`; page with ?before=<next_before>&limit=20 (max 100).
+      next_before is an opaque cursor (timestamp,type,id): items sharing a timestamp are never skipped.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        before = request.query_params.get("before")
+        if before:
+            before = parse_cursor(before)
+            if before is None:
+                raise ValidationError({"before": "Use the next_before value from the previous page."})
+        limit = _limit_param(request.query_params)
+
+        user = request.user
+        semester = None if user.is_staff else get_user_semester(user)
+        items, next_before = inbox_items(user, semester, before=before, limit=limit)
+        return Response({"results": items, "next_before": next_before})
+
+
+class InboxReadView(GenericAPIView):
+    """
+    Mark inbox items as read.
+    - {"all": true} marks everything up to now as read.
+    - {"type": "notice", "ids": [1, 2]} marks single items.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = InboxReadSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        user = request.user
+        semester = None if user.is_staff else get_user_semester(user)
+        if data["all"]:
+            read_up_to = mark_all_read(user, semester)
+            return Response({"message": "All caught up.", "read_up_to": read_up_to})
+
+        mark_read(user, data["type"], data["ids"], semester)
+        return Response({"message": "Marked as read."})
+
+
+class UnreadCountView(APIView):
+    """
+    Number of unread notices + events for the app badge.
+    Answered from cached counters, cheap enough to call on every app launch.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        semester = None if user.is_staff else get_user_semester(user)
+        return Response({"unread": unread_count(user, semester)})
+
+
+# -------------------- DEVICES --------------------
+class DeviceRegisterView(GenericAPIView):
+    """
+    Register an FCM device token (on first launch or when Firebase rotates it).
+    - Linked to the logged-in user, if any; a token moves to whoever registers it last.
+    - One INSERT ... ON CONFLICT, however often it is called.
+    """
+    permission_classes = [AllowAny]
+    serializer_class = DeviceTokenSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_id = request.user.pk if request.user.is_authenticated else None
+        register_device(serializer.validated_data["token"], user_id)
+        return Response({"message": "Device registered."}, status=status.HTTP_200_OK)
+
+
+class DeviceHeartbeatView(GenericAPIView):
+    """
+    "This device is still in use", sent on every app open.
+    Buffered in memory and written in bulk every few seconds, so it costs no query.
+    Unauthenticated, so it is rate limited per IP.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = "device_heartbeat"
+    serializer_class = DeviceTokenSerializer
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        heartbeats.touch(serializer.validated_data["token"])
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
+# -------------------- LIVE FEED (Server-Sent Events) --------------------
+LIVE_HEARTBEAT_SECONDS = 15
+
+
+def get_jwt_user(request, allow_query_token=False):
+    """
+    User of a plain Django request (async views do not go through DRF auth).
+    JWT from the Authorization header, or ?token= for EventSource clients
+    (browsers cannot set headers on an EventSource). Returns None if missing/invalid.
+    """
+    authenticator = ClaimsJWTAuthentication()
+    try:
+        raw_token = request.GET.get("token") if allow_query_token else None
+        if raw_token:
+            return authenticator.get_user(authenticator.get_validated_token(raw_token))
+        result = authenticator.authenticate(request)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+    return result[0] if result else None
+
+
+def _live_start(request, user):
+    semester = None if user.is_staff else get_user_semester(user)
+    last_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    try:
+        last_id = int(last_id)
+    except (TypeError, ValueError):
+        last_id = None
+    return semester, last_id
+
+
+async def live_feed(request):
+    """
+    Stream of new/updated/deleted notices and events for the caller (text/event-stream).
+    - Each message: `event: notice|event`, `data: {"type", "object_id", "action"}`.
+    - Reconnects resume from `Last-Event-ID`; `event: reset` means messages were
+      missed and the client should refetch its lists.
+    - Needs ASGI (uvicorn/daphne); idle connections just await the hub.
+      Under WSGI (runserver, gunicorn) Django would buffer the endless stream in
+      a worker thread forever, so the request is refused with a 501.
+    """
+    if request.method != "GET":
+        return JsonResponse({"error": "Method not allowed."}, status=405)
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "The live feed needs the ASGI server: uvicorn NOTICE.asgi:application."},
+            status=501,
+        )
+
+    user = await sync_to_async(get_jwt_user)(request, allow_query_token=True)
+    if user is None or not user.is_active:
+        return JsonResponse({"error": "Authentication credentials were not provided or are invalid."}, status=401)
+    semester, last_id = await sync_to_async(_live_start)(request, user)
+    is_staff = user.is_staff
+
+    async def stream():
+        cursor = last_id
+        yield "retry: 5000\n\n"
+        if cursor is None:
+            cursor = hub.last_id
+        elif hub.since(cursor) is None:
+            cursor = hub.last_id
+            yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+
+        while True:
+            batch = await hub.wait(cursor, LIVE_HEARTBEAT_SECONDS)
+            if batch is None:
+                # Fell behind the buffer
+                cursor = hub.last_id
+                yield f"id: {cursor}\nevent: reset\ndata: {{}}\n\n"
+                continue
+            if not batch:
+                yield ": keep-alive\n\n"
+                continue
+            for message in batch:
+                if is_visible(message, semester, is_staff):
+                    yield format_sse(message)
+            cursor = batch[-1]["id"]
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+    return response
+
 
 class ChangePasswordView(APIView):
     """
@@ -435,6 +887,9 @@ class ChangePasswordView(APIView):
 class ForgotPasswordView(GenericAPIView):
     serializer_class = ForgotPasswordSerializer
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "forgot_password"
     parser_classes = [FormParser, MultiPartParser] 
 
     def post(self, request):
@@ -448,6 +903,9 @@ class ForgotPasswordView(GenericAPIView):
 class ResetPasswordView(GenericAPIView):
     serializer_class = ResetPasswordSerializer
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [IPRateThrottle, EmailRateThrottle]
+    throttle_scope = "reset_password"
     parser_classes = [FormParser, MultiPartParser] 
 
     def post(self, request):
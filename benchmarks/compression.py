@@ -0,0 +1,99 @@
+"""
+Transfer size benchmark for CompressionMiddleware (api/compression.py).
+
+    python benchmarks/compression.py --notices 100
+
+Runs against a throwaway test database (never the real one): creates notices
+with realistic bodies, then requests the notice list, every notice detail and
+the events feed with no Accept-Encoding, with gzip and with br, and reports the
+median bytes on the wire and the time the middleware added per response.
+Brotli is only measured when the brotli module is installed.
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "NOTICE.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from api import compression  # noqa: E402
+from api.models import Event, Notice  # noqa: E402
+
+PARAGRAPH = (
+    "Dear students, the mid-term examination schedule for all programmes has been "
+    "published. Please check the routine, bring your admit card and arrive fifteen "
+    "minutes early. Students with back papers must fill the form at the account "
+    "section before Friday. परीक्षा तालिका प्रकाशित गरिएको छ। "
+)
+
+
+def fill(notices):
+    author = User.objects.create(username="bench-author", is_staff=True)
+    now = timezone.now()
+    Notice.objects.bulk_create([
+        Notice(title=f"Notice {i}: examination schedule", content=PARAGRAPH * (3 + i % 10), author=author,
+               featured_image=f"notice_images/2025/01/01/n{i}.jpg", published_at=now - datetime.timedelta(hours=i))
+        for i in range(notices)
+    ])
+    Event.objects.bulk_create([
+        Event(event_title=f"Event {i}", event_date=now.date() + datetime.timedelta(days=i),
+              start_time=datetime.time(10), end_time=datetime.time(12), event_detail=PARAGRAPH * 2,
+              location="Main hall", image=f"events/e{i}.jpg")
+        for i in range(notices // 2)
+    ])
+    return author
+
+
+def measure(client, paths, encoding):
+    sizes, timings = [], []
+    for path in paths:
+        started = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": encoding} if encoding else {})
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200, (path, response.status_code)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        sizes.append(len(body))
+    return statistics.median(sizes), statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notices", type=int, default=100)
+    args = parser.parse_args()
+
+    encodings = ["", "gzip"] + (["br"] if compression.brotli else [])
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        client = Client()
+        client.force_login(fill(args.notices))
+        feeds = {
+            "notice list": ["/api/notices/"],
+            "notice detail": [f"/api/notices/{pk}/" for pk in Notice.objects.values_list("pk", flat=True)],
+            "events.ics": ["/api/calendar/events.ics"],
+        }
+        print(f"{'feed':<16}{'encoding':<10}{'median bytes':>14}{'ratio':>8}{'median ms':>11}")
+        for name, paths in feeds.items():
+            measure(client, paths[:1], "")  # warm up
+            plain = None
+            for encoding in encodings:
+                size, ms = measure(client, paths, encoding)
+                plain = plain or size
+                print(f"{name:<16}{encoding or 'identity':<10}{size:>14.0f}{plain / size:>7.1f}x{ms:>11.2f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+JSON benchmark: DRF's stdlib JSONRenderer/JSONParser against api/renderers.py.
+
+    python benchmarks/json_render.py --notices 200 --rounds 200
+
+Runs against a throwaway test database (never the real one): fills it with
+notices, events and routines, builds the same payloads the list/detail
+endpoints return (real serializers and querysets), then times rendering each
+payload with both renderers and parsing it back with both parsers.
+Rendering is what a GET pays per response; parsing is what a JSON POST pays.
+Without orjson installed both columns use the stdlib and should match.
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "NOTICE.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api import renderers  # noqa: E402
+from api.models import Event, Notice, Routine  # noqa: E402
+from api.serializers import (  # noqa: E402
+    EventListSerializer, NoticeListSerializer, NoticeSerializer, RoutineSerializer,
+)
+from api.views import event_list_fields, notice_list_fields  # noqa: E402
+
+CONTENT = (
+    "Dear students, the mid-term examination schedule for all programmes has been "
+    "published. Please check the routine below, bring your admit card and arrive "
+    "fifteen minutes early. Nepali: परीक्षा तालिका प्रकाशित गरिएको छ। "
+) * 12
+
+
+def fill(notices):
+    author = User.objects.create(username="bench-author", is_staff=True)
+    now = timezone.now()
+    Notice.objects.bulk_create([
+        Notice(title=f"Notice {i}: exam schedule", content=CONTENT, author=author,
+               semester=i % 8 + 1 if i % 3 else None, featured_image=f"notice_images/2025/01/01/n{i}.jpg",
+               published_at=now - datetime.timedelta(hours=i))
+        for i in range(notices)
+    ])
+    Event.objects.bulk_create([
+        Event(event_title=f"Event {i}", event_date=now.date() + datetime.timedelta(days=i),
+              start_time=datetime.time(10), end_time=datetime.time(12, 30),
+              event_detail=CONTENT, location="Main hall", image=f"events/e{i}.jpg")
+        for i in range(notices // 2)
+    ])
+    Routine.objects.bulk_create([
+        Routine(semester=str(semester), day=day, day_ordinal=ordinal, subject=f"Subject {period}",
+                start_time=datetime.time(7 + period), end_time=datetime.time(8 + period))
+        for semester in range(1, 9)
+        for ordinal, day in enumerate(["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday"])
+        for period in range(5)
+    ])
+
+
+def payloads():
+    context = {"request": Request(APIRequestFactory().get("/api/notices/"))}
+    notices = notice_list_fields(Notice.objects.order_by("-published_at"))
+    return {
+        "notice list": NoticeListSerializer(notices, many=True, context=context).data,
+        "notice detail": NoticeSerializer(Notice.objects.first(), context=context).data,
+        "event list": EventListSerializer(event_list_fields(Event.objects.all()), many=True, context=context).data,
+        "routine list": RoutineSerializer(Routine.objects.all(), many=True, context=context).data,
+    }
+
+
+def timed(function, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        function()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notices", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        fill(args.notices)
+        data = payloads()
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"orjson: {'installed' if renderers.orjson else 'not installed (stdlib fallback)'}")
+    print(f"{'payload':<16}{'bytes':>9}{'render µs':>12}{'fast µs':>10}{'parse µs':>11}{'fast µs':>10}")
+    slow_renderer, fast_renderer = JSONRenderer(), renderers.FastJSONRenderer()
+    slow_parser, fast_parser = JSONParser(), renderers.FastJSONParser()
+    for name, payload in data.items():
+        body = slow_renderer.render(payload)
+        assert fast_parser.parse(io.BytesIO(fast_renderer.render(payload))) == slow_parser.parse(io.BytesIO(body))
+        print(
+            f"{name:<16}{len(body):>9}"
+            f"{timed(lambda: slow_renderer.render(payload), args.rounds):>12.0f}"
+            f"{timed(lambda: fast_renderer.render(payload), args.rounds):>10.0f}"
+            f"{timed(lambda: slow_parser.parse(io.BytesIO(body)), args.rounds):>11.0f}"
+            f"{timed(lambda: fast_parser.parse(io.BytesIO(body)), args.rounds):>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
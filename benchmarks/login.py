@@ -0,0 +1,86 @@
+"""
+Login lookup benchmark: the old two-step login against the email backend.
+
+    python benchmarks/login.py --users 50000 --logins 2000
+
+Runs against a throwaway test database (never the real one): creates `--users`
+accounts, then times both login paths for random existing emails and reports
+the mean time, queries per login and the query plan of the email lookup.
+A fast hasher is used so the numbers show the database part of a login;
+the real PBKDF2 check costs the same on both paths.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "NOTICE.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import authenticate  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from api.backends import users_by_email  # noqa: E402
+
+PASSWORD = "campus-pass-123"
+
+
+def old_login(email):
+    user = User.objects.get(email=email)
+    return authenticate(username=user.username, password=PASSWORD)
+
+
+def new_login(email):
+    return authenticate(None, email=email, password=PASSWORD)
+
+
+def measure(login, emails):
+    timings = []
+    with CaptureQueriesContext(connection) as queries:
+        for email in emails:
+            started = time.perf_counter()
+            assert login(email) is not None
+            timings.append(time.perf_counter() - started)
+    return statistics.mean(timings) * 1000, len(queries) / len(emails)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--logins", type=int, default=1000)
+    args = parser.parse_args()
+
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [User(username=f"student{i}", email=f"Student{i}@campus.edu", password=password)
+             for i in range(args.users)],
+            batch_size=2000,
+        )
+        emails = [f"Student{random.randrange(args.users)}@campus.edu" for _ in range(args.logins)]
+
+        print(f"{args.users} users, {args.logins} logins")
+        for name, login in (("get(email) + authenticate(username)", old_login), ("EmailBackend", new_login)):
+            mean_ms, queries = measure(login, emails)
+            print(f"{name:<40}{mean_ms:>8.3f} ms/login{queries:>6.1f} queries/login")
+
+        print("\nEmail lookup plan:")
+        print(users_by_email(emails[0].upper()).explain())
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Load test for the read endpoints: sync DRF views under WSGI vs async views under ASGI.
+
+Start the two servers (same database, same number of worker processes):
+
+    gunicorn NOTICE.wsgi:application -w 4 --threads 8 -b 127.0.0.1:8001
+    uvicorn NOTICE.asgi:application --workers 4 --port 8002
+
+Then run:
+
+    python benchmarks/read_paths.py --token <access token> --concurrency 500 --duration 20
+
+Each path pair is hammered with `--concurrency` keep-alive connections for
+`--duration` seconds; the report shows requests/second, p50 and p99 latency
+and the number of failed requests. Only the standard library is needed.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+PATHS = [
+    # (WSGI path, ASGI path)
+    ("/api/notices/", "/api/async/notices/"),
+    ("/api/events/", "/api/async/events/"),
+    ("/api/routines/", "/api/async/routines/"),
+    ("/api/auth/profile/", "/api/async/profile/"),
+]
+
+
+async def _request(reader, writer, host, path, token):
+    headers = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n"
+    if token:
+        headers += f"Authorization: Bearer {token}\r\n"
+    writer.write((headers + "\r\n").encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed")
+    status = int(status_line.split()[1])
+
+    length, chunked, close = 0, False, False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding" and "chunked" in value:
+            chunked = True
+        elif name == "connection" and value == "close":
+            close = True
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length:
+        await reader.readexactly(length)
+    return status, close
+
+
+async def _worker(base, path, token, deadline, latencies, errors):
+    url = urlsplit(base)
+    host, port = url.hostname, url.port or 80
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            status, close = await _request(reader, writer, url.netloc, path, token)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors.append("connection")
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run(base, path, token, concurrency, duration):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(base, path, token, deadline, latencies, errors) for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wsgi", default="http://127.0.0.1:8001")
+    parser.add_argument("--asgi", default="http://127.0.0.1:8002")
+    parser.add_argument("--token", help="JWT access token (the profile endpoints need one)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<24}{'server':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for wsgi_path, asgi_path in PATHS:
+        for server, base, path in (("wsgi", args.wsgi, wsgi_path), ("asgi", args.asgi, asgi_path)):
+            result = asyncio.run(run(base, path, args.token, args.concurrency, args.duration))
+            print(
+                f"{wsgi_path:<24}{server:<8}{result['rps']:>10.0f}"
+                f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Concurrent read/write benchmark: SQLite defaults against the production profile.
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 4 --duration 10
+
+Runs on a throwaway database file (never the real one). Reader processes run
+notice-list style SELECTs while writer processes insert and update rows in
+short transactions, first with SQLite's defaults (rollback journal, deferred
+transactions) and then with SQLITE_PRAGMAS from the settings plus BEGIN
+IMMEDIATE. Reports operations/second, p99 latency and "database is locked"
+errors for each side. Only the standard library is needed.
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["CAMPUS_SQLITE_PRODUCTION"] = "1"
+
+from NOTICE.settings import DATABASES, SQLITE_PRAGMAS  # noqa: E402
+
+TIMEOUT = DATABASES["default"]["OPTIONS"]["timeout"]
+
+
+def connect(path, production):
+    db = sqlite3.connect(path, timeout=TIMEOUT, isolation_level=None)
+    if production:
+        for name, value in SQLITE_PRAGMAS.items():
+            db.execute(f"PRAGMA {name} = {value}")
+    return db
+
+
+def setup(path, rows):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode = DELETE")
+    db.execute(
+        "CREATE TABLE notice (id INTEGER PRIMARY KEY, title TEXT, body TEXT, semester TEXT, created REAL)"
+    )
+    db.execute("CREATE INDEX notice_semester_created ON notice (semester, created)")
+    db.executemany(
+        "INSERT INTO notice (title, body, semester, created) VALUES (?, ?, ?, ?)",
+        ((f"Notice {i}", "x" * 400, str(i % 8 + 1), float(i)) for i in range(rows)),
+    )
+    db.commit()
+    db.close()
+
+
+def reader(path, production, deadline, results):
+    db = connect(path, production)
+    latencies, errors, semester = [], 0, 0
+    while time.perf_counter() < deadline:
+        semester = semester % 8 + 1
+        started = time.perf_counter()
+        try:
+            db.execute(
+                "SELECT id, title, body FROM notice WHERE semester = ? ORDER BY created DESC LIMIT 20",
+                (str(semester),),
+            ).fetchall()
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors += 1
+    results.put(("read", latencies, errors))
+
+
+def writer(path, production, deadline, results):
+    db = connect(path, production)
+    begin = "BEGIN IMMEDIATE" if production else "BEGIN"
+    latencies, errors, n = [], 0, 0
+    while time.perf_counter() < deadline:
+        n += 1
+        started = time.perf_counter()
+        try:
+            db.execute(begin)
+            # Read-then-write: in a deferred transaction two writers can both hold
+            # the read lock and deadlock on the upgrade, failing at once.
+            (latest,) = db.execute("SELECT max(id) FROM notice").fetchone()
+            db.execute(
+                "INSERT INTO notice (title, body, semester, created) VALUES (?, ?, ?, ?)",
+                (f"New {n}", "y" * 400, str(n % 8 + 1), time.time()),
+            )
+            db.execute("UPDATE notice SET title = ? WHERE id = ?", (f"Edited {n}", latest))
+            db.execute("COMMIT")
+            latencies.append(time.perf_counter() - started)
+        except sqlite3.OperationalError:
+            errors += 1
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+    results.put(("write", latencies, errors))
+
+
+def run(production, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        setup(path, args.rows)
+        results = multiprocessing.Queue()
+        deadline = time.perf_counter() + args.duration
+        processes = [
+            multiprocessing.Process(target=reader, args=(path, production, deadline, results))
+            for _ in range(args.readers)
+        ] + [
+            multiprocessing.Process(target=writer, args=(path, production, deadline, results))
+            for _ in range(args.writers)
+        ]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    report = {}
+    for kind in ("read", "write"):
+        latencies = sorted(l for k, ls, _ in collected if k == kind for l in ls)
+        errors = sum(e for k, _, e in collected if k == kind)
+        report[kind] = (
+            len(latencies) / args.duration,
+            latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+            errors,
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.rows} rows, {args.duration:g}s each")
+    print(f"{'profile':<12}{'op':<7}{'ops/s':>10}{'p99 ms':>10}{'locked':>8}")
+    for name, production in (("default", False), ("production", True)):
+        report = run(production, args)
+        for kind, (rate, p99, errors) in report.items():
+            print(f"{name:<12}{kind:<7}{rate:>10.0f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()